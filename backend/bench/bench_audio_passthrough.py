@@ -0,0 +1,73 @@
+"""
+Benchmark: per-chunk CPU cost of forwarding Grok output audio to the browser.
+
+Compares the old decode/re-encode/model_dump path with the passthrough paths
+used by TutorConnection today. Each path goes from the upstream base64 delta
+to the payload handed to the browser WebSocket.
+
+Run from the backend directory:
+    python -m bench.bench_audio_passthrough
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+
+from src.types import VoiceAudioServerMessage
+
+
+def legacy_path(delta_b64: str) -> str:
+    """Decode in GrokVoiceClient, re-encode and model_dump in TutorConnection."""
+    audio_bytes = base64.b64decode(delta_b64)
+    audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
+    msg = VoiceAudioServerMessage(audio=audio_b64)
+    return json.dumps(msg.model_dump(), separators=(",", ":"))
+
+
+def passthrough_json_path(delta_b64: str) -> str:
+    """Forward the upstream base64 string in a plain dict (json audio mode)."""
+    return json.dumps({"type": "VOICE_AUDIO", "audio": delta_b64}, separators=(",", ":"))
+
+
+def passthrough_binary_path(delta_b64: str) -> bytes:
+    """Decode once and send raw PCM16 as a binary frame (binary audio mode)."""
+    return base64.b64decode(delta_b64)
+
+
+PATHS = {
+    "legacy": legacy_path,
+    "passthrough_json": passthrough_json_path,
+    "passthrough_binary": passthrough_binary_path,
+}
+
+
+def bench(func, delta_b64: str, iterations: int) -> float:
+    """Return CPU microseconds per chunk."""
+    start = time.process_time()
+    for _ in range(iterations):
+        func(delta_b64)
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    parser.add_argument("--chunk-ms", type=int, nargs="+", default=[20, 40, 100])
+    args = parser.parse_args()
+
+    print(f"{'chunk':>8} {'bytes':>7} " + " ".join(f"{name:>20}" for name in PATHS))
+    for chunk_ms in args.chunk_ms:
+        pcm = os.urandom(args.sample_rate * 2 * chunk_ms // 1000)
+        delta_b64 = base64.b64encode(pcm).decode("ascii")
+        results = {name: bench(func, delta_b64, args.iterations) for name, func in PATHS.items()}
+        print(
+            f"{chunk_ms:>6}ms {len(pcm):>7} "
+            + " ".join(f"{results[name]:>17.2f} us" for name in PATHS)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: JSON encode/decode cost of the proxy's message mix, per codec backend.
+
+Replays one second of a tutor turn the way the proxy sees it: mic audio from
+the browser (4096-sample frames at 48kHz) forwarded to Grok, Grok audio deltas
+forwarded to the browser, transcript and tool-call deltas, a canvas change and
+a few pydantic status messages. Each message is decoded and/or encoded exactly
+as the hop does it, including the str <-> UTF-8 conversion the sockets need.
+
+"legacy" is the stdlib json + model_dump path used before src/codec.py.
+
+Run from the backend directory:
+    python -m bench.bench_codec
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+
+from src.codec import JsonCodec, available_codecs
+from src.types import (
+    AddAnimatedTextCommand,
+    CanvasCommandMessage,
+    TutorStatusMessage,
+    VoiceStateMessage,
+)
+
+
+def _b64(size: int) -> str:
+    return base64.b64encode(os.urandom(size)).decode("ascii")
+
+
+def build_mix() -> dict[str, tuple[int, object]]:
+    """Message kind -> (count per second, payload)."""
+    shape = {
+        "id": "shape:abc123",
+        "type": "draw",
+        "x": 412.5,
+        "y": 188.25,
+        "props": {"color": "black", "size": "m", "segments": [{"points": [[0, 0], [3, 4]] * 40}]},
+    }
+    return {
+        # Browser -> proxy -> Grok
+        "browser VOICE_AUDIO in": (12, json.dumps({"type": "VOICE_AUDIO", "audio": _b64(8192)})),
+        "grok append out": (12, {"type": "input_audio_buffer.append", "audio": _b64(8192)}),
+        "browser CANVAS_CHANGE in": (
+            1,
+            json.dumps({"type": "CANVAS_CHANGE", "added": [shape], "modified": [], "deleted": []}),
+        ),
+        # Grok -> proxy -> browser
+        "grok audio delta in": (
+            10,
+            json.dumps(
+                {"type": "response.output_audio.delta", "item_id": "item_1", "delta": _b64(4800)}
+            ).encode(),
+        ),
+        "browser VOICE_AUDIO out": (10, {"type": "VOICE_AUDIO", "audio": _b64(4800)}),
+        "grok transcript delta in": (
+            15,
+            json.dumps(
+                {
+                    "type": "response.output_audio_transcript.delta",
+                    "item_id": "item_1",
+                    "delta": "Let's ",
+                }
+            ).encode(),
+        ),
+        "grok function args delta in": (
+            4,
+            json.dumps(
+                {"type": "response.function_call_arguments.delta", "call_id": "c1", "delta": '{"te'}
+            ).encode(),
+        ),
+        "browser model out": (
+            3,
+            [
+                VoiceStateMessage(state="speaking"),
+                TutorStatusMessage(status="thinking"),
+                CanvasCommandMessage(command=AddAnimatedTextCommand(text="x = 4", x=120, y=80)),
+            ],
+        ),
+    }
+
+
+def legacy_step(kind: str, payload) -> None:
+    if kind.startswith("browser") and kind.endswith(" in"):
+        json.loads(payload)  # starlette hands us str
+    elif kind.startswith("grok") and kind.endswith(" in"):
+        json.loads(payload.decode("utf-8"))  # websockets decodes text frames to str
+    elif kind == "grok append out":
+        json.dumps(payload).encode("utf-8")
+    elif kind == "browser VOICE_AUDIO out":
+        json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    elif kind == "browser model out":
+        for model in payload:
+            json.dumps(model.model_dump(), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def codec_step(codec: JsonCodec, kind: str, payload) -> None:
+    if kind.endswith(" in"):
+        codec.loads(payload)  # Grok frames are read undecoded
+    elif kind == "grok append out":
+        codec.dumps(payload)  # sent as a text frame without a str round trip
+    elif kind == "browser VOICE_AUDIO out":
+        codec.dumps(payload).decode("utf-8").encode("utf-8")  # starlette send_text takes str
+    elif kind == "browser model out":
+        for model in payload:
+            model.model_dump_json().encode("utf-8")
+
+
+def bench(step, mix: dict, seconds_of_audio: int) -> dict[str, float]:
+    """Return microseconds spent per kind over `seconds_of_audio` mixes."""
+    totals = {}
+    for kind, (count, payload) in mix.items():
+        start = time.perf_counter()
+        for _ in range(count * seconds_of_audio):
+            step(kind, payload)
+        totals[kind] = (time.perf_counter() - start) / seconds_of_audio * 1e6
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=500, help="seconds of session to replay")
+    parser.add_argument("--repeat", type=int, default=5, help="report the best of N runs")
+    args = parser.parse_args()
+
+    mix = build_mix()
+    candidates = {"legacy": legacy_step}
+    for codec in available_codecs():
+        candidates[codec.name] = lambda kind, payload, codec=codec: codec_step(codec, kind, payload)
+
+    results = {}
+    for name, step in candidates.items():
+        bench(step, mix, max(1, args.seconds // 10))  # warm up
+        runs = [bench(step, mix, args.seconds) for _ in range(args.repeat)]
+        results[name] = {kind: min(run[kind] for run in runs) for kind in mix}
+
+    width = max(len(kind) for kind in mix)
+    print(f"{'us per second of session':<{width}}  " + "  ".join(f"{n:>9}" for n in results))
+    for kind in mix:
+        print(f"{kind:<{width}}  " + "  ".join(f"{results[n][kind]:9.1f}" for n in results))
+    totals = {name: sum(r.values()) for name, r in results.items()}
+    print(f"{'total':<{width}}  " + "  ".join(f"{totals[n]:9.1f}" for n in results))
+    print(
+        f"{'speedup vs legacy':<{width}}  "
+        + "  ".join(f"{totals['legacy'] / totals[n]:8.2f}x" for n in results)
+    )
+
+
+if __name__ == "__main__":
+    main()
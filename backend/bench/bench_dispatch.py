@@ -0,0 +1,132 @@
+"""
+Microbenchmark: GrokVoiceClient._handle_message dispatch cost per event type.
+
+Feeds pre-parsed Grok messages straight into the client (no socket) with
+no-op callbacks attached, so the numbers are the client's own per-event
+overhead: type lookup, logging, bookkeeping and callback fan-out.
+
+Run from the backend directory:
+    python -m bench.bench_dispatch
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import os
+import time
+
+from src.grok_client import GrokConfig, GrokVoiceClient
+
+
+class _NullSocket:
+    """Stands in for the Grok websocket so sends are free."""
+
+    async def send(self, message) -> None:
+        pass
+
+
+def build_events() -> dict[str, dict]:
+    audio_b64 = base64.b64encode(os.urandom(4800)).decode("ascii")  # 100ms at 24kHz
+    return {
+        "response.output_audio.delta": {
+            "type": "response.output_audio.delta",
+            "item_id": "item_1",
+            "delta": audio_b64,
+        },
+        "response.output_audio_transcript.delta": {
+            "type": "response.output_audio_transcript.delta",
+            "item_id": "item_1",
+            "delta": "Let's ",
+        },
+        "response.function_call_arguments.delta": {
+            "type": "response.function_call_arguments.delta",
+            "item_id": "item_2",
+            "call_id": "call_1",
+            "delta": '{"text": "x',
+        },
+        "input_audio_buffer.speech_started": {"type": "input_audio_buffer.speech_started"},
+        "response.created": {"type": "response.created"},
+        "response.done": {"type": "response.done"},
+        "conversation.item.created": {"type": "conversation.item.created"},
+    }
+
+
+def build_client() -> GrokVoiceClient:
+    def noop(*args) -> None:
+        pass
+
+    client = GrokVoiceClient(
+        api_key="bench",
+        config=GrokConfig(),
+        on_audio_b64=noop,
+        on_transcript=noop,
+        on_speech_started=noop,
+        on_speech_stopped=noop,
+        on_response_started=noop,
+        on_response_done=noop,
+        on_error=noop,
+        on_function_call=noop,
+    )
+    client._ws = _NullSocket()
+    client._connected = True
+    client._session_configured = True
+    return client
+
+
+# Untimed messages between bursts that reset the client's accumulated state
+RESET = [{"type": "response.done"}, {"type": "response.created"}]
+OPEN_FUNCTION_CALL = {
+    "type": "response.output_item.added",
+    "item": {"type": "function_call", "id": "item_2", "call_id": "call_1", "name": "draw_on_canvas"},
+}
+RESET_BEFORE = {"response.function_call_arguments.delta": RESET + [OPEN_FUNCTION_CALL]}
+
+
+async def bench_event(
+    client: GrokVoiceClient, message: dict, iterations: int, burst: int = 250
+) -> float:
+    """Return wall-clock microseconds per dispatched event.
+
+    Events are timed in bursts the size of a typical response, with untimed
+    messages between bursts that reset the client's accumulated state.
+    """
+    reset = RESET_BEFORE.get(message["type"], RESET)
+    elapsed = 0.0
+    for _ in range(max(1, iterations // burst)):
+        for reset_message in reset:
+            await client._handle_message(reset_message)
+        start = time.perf_counter()
+        for _ in range(burst):
+            await client._handle_message(message)
+        elapsed += time.perf_counter() - start
+    return elapsed / (max(1, iterations // burst) * burst) * 1e6
+
+
+async def run(iterations: int, repeat: int) -> dict[str, float]:
+    client = build_client()
+    results = {}
+    # Logged events print; send that to /dev/null so it costs what it would in production
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for event_type, message in build_events().items():
+            await bench_event(client, message, iterations // 10)  # warm up
+            results[event_type] = min(
+                [await bench_event(client, message, iterations) for _ in range(repeat)]
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5, help="report the best of N runs")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations, args.repeat))
+    width = max(len(name) for name in results)
+    for event_type, micros in results.items():
+        print(f"{event_type:<{width}}  {micros:8.3f} us/event")
+
+
+if __name__ == "__main__":
+    main()
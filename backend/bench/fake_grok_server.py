@@ -0,0 +1,344 @@
+"""
+Local stand-in for the Grok realtime API, for load testing without API quota.
+
+Speaks the subset of the protocol GrokVoiceClient uses: conversation.created on
+connect, session.updated after session.update, a simple energy-based server
+VAD over input_audio_buffer.append (speech_started / speech_stopped /
+committed plus a student transcript), and scripted responses made of audio
+and transcript deltas and streamed function calls, ending in response.done.
+response.cancel stops the running response.
+
+Everything the server says, and how fast, comes from a JSON script. Run it
+with the built-in script or your own (--dump-script prints the default as a
+starting point), then point the backend at it:
+
+    python -m bench.fake_grok_server --port 8765
+    XAI_REALTIME_URL=ws://127.0.0.1:8765 uv run uvicorn src.main:app
+
+Script format (all keys optional, missing ones fall back to DEFAULT_SCRIPT):
+    conversation_created_ms  delay before conversation.created
+    session_updated_ms       delay between session.update and session.updated
+    vad                      {"threshold", "silence_ms", "min_speech_ms"}; threshold
+                             is the mean absolute PCM16 sample value counted as speech
+    student_transcript       text sent as the transcription of each detected turn
+    on_speech                responses run after speech_stopped, used in rotation
+    on_response_create       responses run on response.create (greeting, tool
+                             results), used in rotation
+
+A response is {"delay_ms": time to first event, "steps": [...]}, with steps:
+    {"audio_ms": 1200, "chunk_ms": 100, "interval_ms": 100, "transcript": "..."}
+    {"function_call": "draw_on_canvas", "arguments": {...}, "chunk_chars": 48, "interval_ms": 10}
+    {"sleep_ms": 200}
+"$NOW_MS" anywhere in function-call arguments is replaced by the wall-clock
+time in milliseconds when the call starts streaming, so clients can measure
+tool-call latency end to end.
+
+Run from the backend directory.
+"""
+
+import argparse
+import array
+import asyncio
+import base64
+import itertools
+import json
+import time
+from typing import Any
+
+import websockets
+from websockets.asyncio.server import Server, ServerConnection, serve
+
+from src import codec
+
+DEFAULT_SCRIPT: dict[str, Any] = {
+    "conversation_created_ms": 40,
+    "session_updated_ms": 30,
+    "vad": {"threshold": 300, "silence_ms": 500, "min_speech_ms": 200},
+    "student_transcript": "Can you help me solve this?",
+    "on_speech": [
+        {
+            "delay_ms": 350,
+            "steps": [
+                {
+                    "function_call": "draw_on_canvas",
+                    "arguments": {
+                        "items": [
+                            {"text": "2x + 3 = 11 @$NOW_MS", "x": 80, "y": 80},
+                            {"text": "2x = 8", "x": 80, "y": 140},
+                            {"text": "x = 4", "x": 80, "y": 200},
+                        ]
+                    },
+                    "chunk_chars": 48,
+                    "interval_ms": 10,
+                },
+                {
+                    "audio_ms": 1500,
+                    "chunk_ms": 100,
+                    "interval_ms": 90,
+                    "transcript": "Let's subtract three from both sides first.",
+                },
+            ],
+        },
+    ],
+    "on_response_create": [
+        {
+            "delay_ms": 250,
+            "steps": [
+                {
+                    "audio_ms": 1000,
+                    "chunk_ms": 100,
+                    "interval_ms": 90,
+                    "transcript": "Great, now what do we do next?",
+                }
+            ],
+        },
+    ],
+}
+
+
+def load_script(path: str | None) -> dict[str, Any]:
+    """DEFAULT_SCRIPT, with any top-level keys from the file at `path` replacing it."""
+    script = dict(DEFAULT_SCRIPT)
+    if path:
+        with open(path) as f:
+            script.update(json.load(f))
+    return script
+
+
+def _mean_abs(pcm: bytes) -> float:
+    """Mean absolute sample value of PCM16, over every 8th sample."""
+    samples = array.array("h", pcm[: len(pcm) - len(pcm) % 2])[::8]
+    return sum(map(abs, samples)) / len(samples) if samples else 0.0
+
+
+class FakeGrokSession:
+    """One client connection: VAD state, the running response and id counters."""
+
+    def __init__(self, ws: ServerConnection, script: dict[str, Any], session_number: int):
+        self.ws = ws
+        self.script = script
+        self.prefix = f"s{session_number}"
+        self.ids = itertools.count(1)
+        self.input_rate = 24000
+        self.output_rate = 24000
+        self.speech_responses = itertools.cycle(script["on_speech"] or [{"steps": []}])
+        self.create_responses = itertools.cycle(script["on_response_create"] or [{"steps": []}])
+        self.response_task: asyncio.Task | None = None
+        self.in_speech = False
+        self.speech_ms = 0.0
+        self.silence_ms = 0.0
+        self._silence_chunks: dict[tuple[int, int], str] = {}
+
+    def next_id(self, kind: str) -> str:
+        return f"{kind}_{self.prefix}_{next(self.ids)}"
+
+    async def send(self, message: dict) -> None:
+        await self.ws.send(codec.dumps(message), text=True)
+
+    async def run(self) -> None:
+        await asyncio.sleep(self.script["conversation_created_ms"] / 1000)
+        await self.send(
+            {"type": "conversation.created", "conversation": {"id": self.next_id("conv")}}
+        )
+        try:
+            async for raw in self.ws:
+                await self.handle(codec.loads(raw))
+        finally:
+            if self.response_task:
+                self.response_task.cancel()
+
+    async def handle(self, message: dict) -> None:
+        msg_type = message.get("type")
+        if msg_type == "input_audio_buffer.append":
+            await self.on_audio(message.get("audio", ""))
+        elif msg_type == "session.update":
+            session = message.get("session", {})
+            audio = session.get("audio", {})
+            self.input_rate = audio.get("input", {}).get("format", {}).get("rate", self.input_rate)
+            self.output_rate = audio.get("output", {}).get("format", {}).get("rate", self.output_rate)
+            await asyncio.sleep(self.script["session_updated_ms"] / 1000)
+            await self.send({"type": "session.updated", "session": session})
+        elif msg_type == "conversation.item.create":
+            item = dict(message.get("item", {}), id=self.next_id("item"))
+            await self.send({"type": "conversation.item.created", "item": item})
+        elif msg_type == "input_audio_buffer.commit":
+            await self.send({"type": "input_audio_buffer.committed", "item_id": self.next_id("item")})
+        elif msg_type == "input_audio_buffer.clear":
+            self.in_speech = False
+            self.speech_ms = self.silence_ms = 0.0
+            await self.send({"type": "input_audio_buffer.cleared"})
+        elif msg_type == "response.create":
+            self.start_response(next(self.create_responses))
+        elif msg_type == "response.cancel":
+            if self.response_task and not self.response_task.done():
+                self.response_task.cancel()
+
+    async def on_audio(self, audio_b64: str) -> None:
+        pcm = base64.b64decode(audio_b64)
+        chunk_ms = len(pcm) / (self.input_rate * 2) * 1000
+        vad = self.script["vad"]
+        loud = _mean_abs(pcm) >= vad["threshold"]
+
+        if not self.in_speech:
+            self.speech_ms = self.speech_ms + chunk_ms if loud else 0.0
+            if self.speech_ms >= vad["min_speech_ms"]:
+                self.in_speech = True
+                self.silence_ms = 0.0
+                await self.send({"type": "input_audio_buffer.speech_started"})
+            return
+
+        self.silence_ms = 0.0 if loud else self.silence_ms + chunk_ms
+        if self.silence_ms >= vad["silence_ms"]:
+            self.in_speech = False
+            self.speech_ms = 0.0
+            item_id = self.next_id("item")
+            await self.send({"type": "input_audio_buffer.speech_stopped", "item_id": item_id})
+            await self.send({"type": "input_audio_buffer.committed", "item_id": item_id})
+            await self.send(
+                {
+                    "type": "conversation.item.input_audio_transcription.completed",
+                    "item_id": item_id,
+                    "transcript": self.script["student_transcript"],
+                }
+            )
+            self.start_response(next(self.speech_responses))
+
+    def start_response(self, response: dict) -> None:
+        if self.response_task and not self.response_task.done():
+            self.response_task.cancel()
+        self.response_task = asyncio.create_task(self.run_response(response))
+
+    async def run_response(self, response: dict) -> None:
+        response_id = self.next_id("resp")
+        status = "completed"
+        await self.send({"type": "response.created", "response": {"id": response_id}})
+        try:
+            await asyncio.sleep(response.get("delay_ms", 0) / 1000)
+            for step in response.get("steps", []):
+                if "audio_ms" in step:
+                    await self.stream_audio(response_id, step)
+                elif "function_call" in step:
+                    await self.stream_function_call(response_id, step)
+                elif "sleep_ms" in step:
+                    await asyncio.sleep(step["sleep_ms"] / 1000)
+        except asyncio.CancelledError:
+            status = "cancelled"
+        try:
+            await self.send(
+                {"type": "response.done", "response": {"id": response_id, "status": status}}
+            )
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    def silence_chunk(self, chunk_ms: int) -> str:
+        key = (self.output_rate, chunk_ms)
+        if key not in self._silence_chunks:
+            size = self.output_rate * 2 * chunk_ms // 1000
+            self._silence_chunks[key] = base64.b64encode(bytes(size)).decode("ascii")
+        return self._silence_chunks[key]
+
+    async def stream_audio(self, response_id: str, step: dict) -> None:
+        item_id = self.next_id("item")
+        chunk_ms = step.get("chunk_ms", 100)
+        interval = step.get("interval_ms", chunk_ms) / 1000
+        chunks = max(1, step["audio_ms"] // chunk_ms)
+        words = step.get("transcript", "").split(" ")
+        base = {"response_id": response_id, "item_id": item_id, "output_index": 0}
+
+        await self.send(
+            {
+                "type": "response.output_item.added",
+                "response_id": response_id,
+                "item": {"id": item_id, "type": "message", "role": "assistant"},
+            }
+        )
+        audio = self.silence_chunk(chunk_ms)
+        for i in range(chunks):
+            await self.send({"type": "response.output_audio.delta", **base, "delta": audio})
+            # Spread the transcript over the audio, a few words per chunk
+            start, end = len(words) * i // chunks, len(words) * (i + 1) // chunks
+            if end > start and words != [""]:
+                delta = " ".join(words[start:end]) + ("" if end == len(words) else " ")
+                await self.send(
+                    {"type": "response.output_audio_transcript.delta", **base, "delta": delta}
+                )
+            await asyncio.sleep(interval)
+        await self.send({"type": "response.output_audio.done", **base})
+        await self.send({"type": "response.output_audio_transcript.done", **base})
+        await self.send({"type": "response.output_item.done", **base})
+
+    async def stream_function_call(self, response_id: str, step: dict) -> None:
+        item_id = self.next_id("item")
+        call_id = self.next_id("call")
+        arguments = json.dumps(step.get("arguments", {})).replace(
+            "$NOW_MS", str(int(time.time() * 1000))
+        )
+        chunk_chars = step.get("chunk_chars", 48)
+        interval = step.get("interval_ms", 10) / 1000
+        base = {"response_id": response_id, "item_id": item_id, "call_id": call_id}
+
+        await self.send(
+            {
+                "type": "response.output_item.added",
+                "response_id": response_id,
+                "item": {
+                    "id": item_id,
+                    "type": "function_call",
+                    "call_id": call_id,
+                    "name": step["function_call"],
+                },
+            }
+        )
+        for i in range(0, len(arguments), chunk_chars):
+            await self.send(
+                {
+                    "type": "response.function_call_arguments.delta",
+                    **base,
+                    "delta": arguments[i : i + chunk_chars],
+                }
+            )
+            await asyncio.sleep(interval)
+        await self.send(
+            {"type": "response.function_call_arguments.done", **base, "arguments": arguments}
+        )
+        await self.send({"type": "response.output_item.done", **base})
+
+
+async def start_server(script: dict[str, Any], host: str = "127.0.0.1", port: int = 8765) -> Server:
+    """Start serving `script` and return the server; close it with server.close()."""
+    session_numbers = itertools.count(1)
+
+    async def handler(ws: ServerConnection) -> None:
+        try:
+            await FakeGrokSession(ws, script, next(session_numbers)).run()
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    return await serve(handler, host, port, max_size=None)
+
+
+async def run(script: dict[str, Any], host: str, port: int) -> None:
+    server = await start_server(script, host, port)
+    print(f"Fake Grok realtime API on ws://{host}:{port}")
+    await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--script", help="JSON script file (defaults to the built-in script)")
+    parser.add_argument("--dump-script", action="store_true", help="print the default script")
+    args = parser.parse_args()
+
+    if args.dump_script:
+        print(json.dumps(DEFAULT_SCRIPT, indent=2))
+        return
+    try:
+        asyncio.run(run(load_script(args.script), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
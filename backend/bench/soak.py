@@ -0,0 +1,406 @@
+"""
+Soak test: N simulated students against the real app, with a fake Grok upstream.
+
+Starts bench/fake_grok_server.py and the FastAPI app (uvicorn) as subprocesses,
+with XAI_REALTIME_URL pointing the app at the fake server. Then it runs N
+students for --duration seconds. Each student:
+
+1. streams mic PCM at real-time pace, alternating speech and silence,
+2. sends a CANVAS_UPDATE with a screenshot before every turn,
+3. triggers the draw_on_canvas tool call that the fake server's script answers
+   each turn with.
+
+Measured per turn and reported as p50/p95/p99 in milliseconds:
+    session_ready       WebSocket accepted -> SESSION_READY
+    speech_to_audio     last speech frame sent -> first VOICE_AUDIO of the reply
+                        (includes the fake server's VAD silence window)
+    tool_to_canvas      tool call started upstream -> CANVAS_COMMAND received,
+                        from the $NOW_MS timestamp the fake server embeds in the
+                        draw text
+
+App CPU time and RSS growth are read from /proc (Linux only) and reported
+per session. The report is JSON on stdout (or --output), so runs can be diffed
+and checked in CI. Other environment variables pass through to the app, e.g.
+JSON_CODEC=json python -m bench.soak to compare codecs.
+
+Run from the backend directory:
+    python -m bench.soak --students 20 --duration 60
+"""
+
+import argparse
+import array
+import asyncio
+import base64
+import json
+import math
+import os
+import random
+import re
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+
+import websockets
+
+DRAW_TIMESTAMP = re.compile(r"@(\d{13})")
+
+
+@dataclass
+class StudentResult:
+    session_ready_ms: float | None = None
+    speech_to_audio_ms: list[float] = field(default_factory=list)
+    tool_to_canvas_ms: list[float] = field(default_factory=list)
+    turns: int = 0
+    timeouts: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def percentiles(values: list[float]) -> dict[str, float | int | None]:
+    """p50/p95/p99 (linear interpolation) plus count and max."""
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def pick(p: float) -> float:
+        rank = (len(ordered) - 1) * p / 100
+        low = math.floor(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    return {
+        "count": len(ordered),
+        "p50": round(pick(50), 1),
+        "p95": round(pick(95), 1),
+        "p99": round(pick(99), 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def make_png(width: int, height: int) -> str:
+    """A noisy RGB PNG as a data URL, so its size is close to width * height * 3."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    rows = b"".join(b"\x00" + random.randbytes(width * 3) for _ in range(height))
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows, 1))
+        + chunk(b"IEND", b"")
+    )
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+
+
+def make_frames(sample_rate: int, frame_samples: int) -> tuple[str, str]:
+    """Base64 PCM16 frames of speech (a loud tone) and of silence."""
+    tone = array.array(
+        "h",
+        (int(6000 * math.sin(2 * math.pi * 220 * i / sample_rate)) for i in range(frame_samples)),
+    )
+    speech = base64.b64encode(tone.tobytes()).decode("ascii")
+    silence = base64.b64encode(bytes(frame_samples * 2)).decode("ascii")
+    return speech, silence
+
+
+class Student:
+    """One simulated browser session."""
+
+    def __init__(self, number: int, url: str, args: argparse.Namespace, screenshot: str):
+        self.number = number
+        self.url = url
+        self.args = args
+        self.screenshot = screenshot
+        self.result = StudentResult()
+        self.speech_frame, self.silence_frame = make_frames(args.sample_rate, args.frame_samples)
+        self.speaking = False
+        self.speech_stopped_at: float | None = None
+        self.first_audio = asyncio.Event()
+        self.voice_state = "idle"
+        self.state_changed = asyncio.Event()
+
+    async def run(self, deadline: float) -> StudentResult:
+        try:
+            async with websockets.connect(self.url, max_size=None) as ws:
+                accepted = time.perf_counter()
+                await self.wait_session_ready(ws, accepted)
+                reader = asyncio.create_task(self.read(ws))
+                mic = asyncio.create_task(self.stream_mic(ws))
+                try:
+                    await self.wait_until_quiet()  # let the greeting finish
+                    while time.monotonic() < deadline and not reader.done():
+                        await self.turn(ws)
+                finally:
+                    mic.cancel()
+                    reader.cancel()
+        except Exception as e:
+            self.result.errors.append(f"{type(e).__name__}: {e}")
+        return self.result
+
+    async def wait_session_ready(self, ws, accepted: float) -> None:
+        async with asyncio.timeout(self.args.turn_timeout):
+            while True:
+                message = json.loads(await ws.recv())
+                if message.get("type") == "SESSION_READY":
+                    self.result.session_ready_ms = (time.perf_counter() - accepted) * 1000
+                    return
+                if message.get("type") == "ERROR":
+                    raise RuntimeError(message.get("message"))
+
+    async def read(self, ws) -> None:
+        async for raw in ws:
+            if isinstance(raw, bytes):
+                self.on_audio()
+                continue
+            message = json.loads(raw)
+            msg_type = message.get("type")
+            if msg_type == "VOICE_AUDIO":
+                self.on_audio()
+            elif msg_type == "VOICE_STATE":
+                self.voice_state = message["state"]
+                self.state_changed.set()
+            elif msg_type == "CANVAS_COMMAND":
+                match = DRAW_TIMESTAMP.search(message["command"].get("text") or "")
+                if match:
+                    self.result.tool_to_canvas_ms.append(time.time() * 1000 - int(match.group(1)))
+            elif msg_type == "ERROR":
+                self.result.errors.append(f"{message.get('code')}: {message.get('message')}")
+
+    def on_audio(self) -> None:
+        if self.speech_stopped_at is not None and not self.first_audio.is_set():
+            elapsed_ms = (time.perf_counter() - self.speech_stopped_at) * 1000
+            self.result.speech_to_audio_ms.append(elapsed_ms)
+            self.first_audio.set()
+
+    async def stream_mic(self, ws) -> None:
+        """Send a mic frame every frame period, like the browser's audio worklet."""
+        period = self.args.frame_samples / self.args.sample_rate
+        next_send = time.monotonic()
+        while True:
+            frame = self.speech_frame if self.speaking else self.silence_frame
+            await ws.send(json.dumps({"type": "VOICE_AUDIO", "audio": frame}))
+            next_send += period
+            await asyncio.sleep(max(0.0, next_send - time.monotonic()))
+
+    async def turn(self, ws) -> None:
+        shapes = [
+            {
+                "id": f"shape:s{self.number}t{self.result.turns}",
+                "type": "draw",
+                "x": 100,
+                "y": 100 + 60 * self.result.turns,
+                "props": {"color": "black", "size": "m"},
+            }
+        ]
+        bounds = {"x": 80, "y": 80, "width": 400, "height": 300, "padding": 20}
+        await ws.send(
+            json.dumps(
+                {
+                    "type": "CANVAS_UPDATE",
+                    "shapes": shapes,
+                    "summary": f"{len(shapes)} shape(s)",
+                    "screenshot": self.screenshot,
+                    "screenshotBounds": bounds,
+                }
+            )
+        )
+        await ws.send(
+            json.dumps(
+                {"type": "VOICE_START", "screenshot": self.screenshot, "screenshotBounds": bounds}
+            )
+        )
+
+        self.first_audio.clear()
+        self.speech_stopped_at = None
+        self.speaking = True
+        await asyncio.sleep(self.args.speech_ms / 1000)
+        self.speaking = False
+        self.speech_stopped_at = time.perf_counter()
+
+        try:
+            async with asyncio.timeout(self.args.turn_timeout):
+                await self.first_audio.wait()
+        except TimeoutError:
+            self.result.timeouts += 1
+        self.speech_stopped_at = None
+        await self.wait_until_quiet()
+        self.result.turns += 1
+        await asyncio.sleep(random.uniform(0.5, 1.5) * self.args.think_ms / 1000)
+
+    async def wait_until_quiet(self) -> None:
+        """Wait for the tutor to go idle and stay idle for --settle-ms."""
+        try:
+            async with asyncio.timeout(self.args.turn_timeout):
+                while True:
+                    if self.voice_state == "idle":
+                        try:
+                            async with asyncio.timeout(self.args.settle_ms / 1000):
+                                self.state_changed.clear()
+                                await self.state_changed.wait()
+                        except TimeoutError:
+                            return
+                    else:
+                        self.state_changed.clear()
+                        await self.state_changed.wait()
+        except TimeoutError:
+            self.result.timeouts += 1
+
+
+class ProcessStats:
+    """CPU time and RSS of a process, read from /proc."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK")
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.ticks  # utime + stime
+
+    def rss_kb(self) -> int:
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+        return 0
+
+
+async def wait_for_port(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Nothing listening on port {port} after {timeout}s")
+            await asyncio.sleep(0.1)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    log = open(args.server_log, "w") if args.server_log else subprocess.DEVNULL
+
+    fake_cmd = [sys.executable, "-m", "bench.fake_grok_server", "--port", str(args.fake_port)]
+    if args.script:
+        fake_cmd += ["--script", args.script]
+    app_env = {
+        **os.environ,
+        "XAI_API_KEY": os.environ.get("XAI_API_KEY") or "soak-test",
+        "XAI_REALTIME_URL": f"ws://127.0.0.1:{args.fake_port}",
+    }
+    app_cmd = [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(args.port)]
+    app_cmd += ["--log-level", "warning"]
+
+    fake = subprocess.Popen(fake_cmd, cwd=backend_dir, stdout=log, stderr=log)
+    app = subprocess.Popen(app_cmd, cwd=backend_dir, env=app_env, stdout=log, stderr=log)
+    try:
+        await wait_for_port(args.fake_port, 15)
+        await wait_for_port(args.port, 30)
+        stats = ProcessStats(app.pid)
+        rss_before = stats.rss_kb()
+        cpu_before = stats.cpu_seconds()
+        started = time.monotonic()
+
+        screenshot = make_png(args.screenshot_width, args.screenshot_height)
+        url = f"ws://127.0.0.1:{args.port}/ws?sampleRate={args.sample_rate}&audio=json"
+        deadline = started + args.duration
+        students = []
+        for number in range(args.students):
+            student = Student(number, url, args, screenshot)
+            students.append(asyncio.create_task(student.run(deadline)))
+            await asyncio.sleep(args.ramp / max(1, args.students))
+
+        rss_peak = rss_before
+        while not all(task.done() for task in students):
+            rss_peak = max(rss_peak, stats.rss_kb())
+            await asyncio.sleep(0.5)
+        results = [task.result() for task in students]
+
+        elapsed = time.monotonic() - started
+        cpu = stats.cpu_seconds() - cpu_before
+        rss_end = stats.rss_kb()
+
+        errors = [error for r in results for error in r.errors]
+        return {
+            "config": {
+                "students": args.students,
+                "duration_s": args.duration,
+                "sample_rate": args.sample_rate,
+                "frame_samples": args.frame_samples,
+                "speech_ms": args.speech_ms,
+                "screenshot_kb": round(len(screenshot) / 1024, 1),
+                "script": args.script,
+                "json_codec": os.environ.get("JSON_CODEC"),
+            },
+            "latency_ms": {
+                "session_ready": percentiles(
+                    [r.session_ready_ms for r in results if r.session_ready_ms is not None]
+                ),
+                "speech_to_audio": percentiles([v for r in results for v in r.speech_to_audio_ms]),
+                "tool_to_canvas": percentiles([v for r in results for v in r.tool_to_canvas_ms]),
+            },
+            "turns": sum(r.turns for r in results),
+            "timeouts": sum(r.timeouts for r in results),
+            "errors": {"count": len(errors), "sample": errors[:10]},
+            "app": {
+                "wall_s": round(elapsed, 2),
+                "cpu_s": round(cpu, 2),
+                "cpu_percent_per_session": round(cpu / elapsed * 100 / args.students, 2),
+                "rss_start_mb": round(rss_before / 1024, 1),
+                "rss_peak_mb": round(rss_peak / 1024, 1),
+                "rss_end_mb": round(rss_end / 1024, 1),
+                "rss_per_session_kb": round((rss_peak - rss_before) / args.students),
+            },
+        }
+    finally:
+        for proc in (app, fake):
+            proc.terminate()
+        for proc in (app, fake):
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if log is not subprocess.DEVNULL:
+            log.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="seconds of turns per student")
+    parser.add_argument(
+        "--ramp", type=float, default=2, help="seconds to spread student connects over"
+    )
+    parser.add_argument("--port", type=int, default=8190, help="port for the app")
+    parser.add_argument("--fake-port", type=int, default=8191, help="port for the fake Grok server")
+    parser.add_argument("--script", help="fake Grok server script (see bench/fake_grok_server.py)")
+    parser.add_argument("--sample-rate", type=int, default=48000)
+    parser.add_argument("--frame-samples", type=int, default=4096, help="samples per mic frame")
+    parser.add_argument("--speech-ms", type=int, default=1500, help="speech per student turn")
+    parser.add_argument("--think-ms", type=int, default=1500, help="mean pause between turns")
+    parser.add_argument("--settle-ms", type=int, default=600, help="idle time that ends a turn")
+    parser.add_argument("--turn-timeout", type=float, default=20)
+    parser.add_argument("--screenshot-width", type=int, default=240)
+    parser.add_argument("--screenshot-height", type=int, default=160)
+    parser.add_argument("--server-log", help="write app and fake server output here")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
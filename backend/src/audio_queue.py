@@ -0,0 +1,132 @@
+"""Bounded outbound audio queue with configurable slow-client policies."""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import Enum
+
+
+class OverflowPolicy(str, Enum):
+    BLOCK = "block"  # Producer waits for room (backpressure onto the Grok socket)
+    DROP_OLDEST = "drop_oldest"  # Oldest queued chunk is discarded to make room
+    DISCONNECT = "disconnect"  # Client is dropped once it falls too far behind
+
+
+class TutorAudioQueue:
+    """Queue of tutor audio chunks waiting to be sent to one browser.
+
+    Items are base64 strings or PCM16 bytes. Memory stays bounded by `maxsize`
+    whatever the policy, so a stalled browser socket cannot grow it without limit.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        max_lag_seconds: float = 10.0,
+        on_overflow: Callable[[], None] | None = None,
+    ):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.max_lag_seconds = max_lag_seconds
+        self.on_overflow = on_overflow  # Called once when the DISCONNECT policy trips
+
+        self._items: deque[tuple[float, str | bytes]] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._overflowed = False
+
+        # Counters exposed per session
+        self.enqueued_chunks = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def overflowed(self) -> bool:
+        return self._overflowed
+
+    def put_nowait(self, item: str | bytes) -> bool:
+        """Queue a chunk without waiting.
+
+        Returns False only under the BLOCK policy when the queue is full; the
+        caller should then `await put(item)`. Other policies always accept, dropping
+        chunks as needed.
+        """
+        if self._overflowed:
+            self._count_drop(item)
+            return True
+
+        if self.policy == OverflowPolicy.DISCONNECT and self._items:
+            lag = time.monotonic() - self._items[0][0]
+            if lag > self.max_lag_seconds:
+                print(f"[AudioQueue] Client is {lag:.1f}s behind, disconnecting")
+                self._overflowed = True
+                self._count_drop(item)
+                self.clear()
+                if self.on_overflow:
+                    self.on_overflow()
+                return True
+
+        if len(self._items) >= self.maxsize:
+            if self.policy == OverflowPolicy.BLOCK:
+                return False
+            _, oldest = self._items.popleft()
+            self._count_drop(oldest)
+
+        self._append(item)
+        return True
+
+    async def put(self, item: str | bytes) -> None:
+        """Queue a chunk, waiting for room under the BLOCK policy."""
+        while not self.put_nowait(item):
+            self._not_full.clear()
+            await self._not_full.wait()
+
+    async def get(self) -> str | bytes:
+        """Wait for and remove the oldest chunk."""
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        _, item = self._items.popleft()
+        self._not_full.set()
+        return item
+
+    def clear(self) -> int:
+        """Discard all queued chunks without counting them as drops. Returns count."""
+        count = len(self._items)
+        self._items.clear()
+        self._not_full.set()
+        return count
+
+    def stats(self) -> dict:
+        """Queue depth and drop counters for diagnostics."""
+        oldest_age = time.monotonic() - self._items[0][0] if self._items else 0.0
+        return {
+            "policy": self.policy.value,
+            "depth": len(self._items),
+            "max_depth": self.max_depth,
+            "maxsize": self.maxsize,
+            "oldest_age_seconds": round(oldest_age, 3),
+            "enqueued_chunks": self.enqueued_chunks,
+            "dropped_chunks": self.dropped_chunks,
+            "dropped_bytes": self.dropped_bytes,
+            "overflowed": self._overflowed,
+        }
+
+    def _append(self, item: str | bytes) -> None:
+        self._items.append((time.monotonic(), item))
+        self.enqueued_chunks += 1
+        if len(self._items) > self.max_depth:
+            self.max_depth = len(self._items)
+        self._not_empty.set()
+
+    def _count_drop(self, item: str | bytes) -> None:
+        self.dropped_chunks += 1
+        # Approximate PCM size for base64 items
+        self.dropped_bytes += len(item) if isinstance(item, bytes) else len(item) * 3 // 4
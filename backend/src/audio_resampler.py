@@ -0,0 +1,92 @@
+"""Streaming PCM16 resampler for converting between browser and Grok sample rates."""
+
+from math import gcd
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (pip install .[audio])
+    np = None  # type: ignore[assignment]
+
+NUMPY_AVAILABLE = np is not None
+
+
+class StreamingResampler:
+    """Polyphase FIR resampler for mono PCM16 that keeps filter state across chunks.
+
+    The conversion ratio is reduced to up/down integers (48000 -> 24000 is 1/2,
+    44100 -> 24000 is 80/147). Each output sample is a dot product of one filter
+    phase with the most recent input samples, computed for the whole chunk at once.
+    The tail of every chunk is kept as history for the next one, so chunk
+    boundaries are seamless and there are no clicks between chunks.
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, taps_per_phase: int = 16):
+        if np is None:
+            raise RuntimeError("numpy is required for audio resampling (pip install .[audio])")
+
+        divisor = gcd(input_rate, output_rate)
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        self.taps_per_phase = taps_per_phase
+
+        self._phases = self._design_filter(self.up, self.down, taps_per_phase)
+        self._history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        self._next_t = 0  # Upsampled index of the next output, relative to the next chunk
+        self._pending_byte = b""  # Odd trailing byte waiting for its pair
+
+    @staticmethod
+    def _design_filter(up: int, down: int, taps_per_phase: int) -> "np.ndarray":
+        """Windowed-sinc low-pass split into `up` phases of `taps_per_phase` taps each."""
+        num_taps = up * taps_per_phase
+        # Cutoff just below the lower Nyquist, in cycles per upsampled sample
+        cutoff = 0.5 / max(up, down) * 0.92
+        n = np.arange(num_taps) - (num_taps - 1) / 2
+        taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(num_taps, 8.0)
+
+        # phases[p, m] = taps[p + m * up]; normalize each phase to unity DC gain
+        phases: np.ndarray = taps.reshape(taps_per_phase, up).T.copy()
+        phases /= phases.sum(axis=1, keepdims=True)
+        return phases.astype(np.float32)
+
+    def reset(self) -> None:
+        """Drop filter history, e.g. when the stream restarts."""
+        self._history[:] = 0
+        self._next_t = 0
+        self._pending_byte = b""
+
+    def process(self, pcm: bytes) -> bytes:
+        """Resample a chunk of little-endian PCM16 and return the converted PCM16."""
+        if self.up == self.down:
+            return pcm
+
+        if self._pending_byte:
+            pcm = self._pending_byte + pcm
+            self._pending_byte = b""
+        if len(pcm) % 2:
+            self._pending_byte = pcm[-1:]
+            pcm = pcm[:-1]
+        if not pcm:
+            return b""
+
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+        count = len(samples)
+        history_len = len(self._history)
+        buffer = np.concatenate((self._history, samples))
+
+        # Output positions on the upsampled time axis that fall inside this chunk
+        positions = np.arange(self._next_t, count * self.up, self.down)
+        self._next_t += len(positions) * self.down - count * self.up
+        self._history = buffer[-history_len:].copy()
+
+        if len(positions) == 0:
+            return b""
+
+        phase = positions % self.up
+        newest = positions // self.up + history_len
+        windows = buffer[newest[:, None] - np.arange(self.taps_per_phase)[None, :]]
+        output = np.einsum("ij,ij->i", self._phases[phase], windows)
+
+        clipped = np.clip(np.rint(output), -32768, 32767).astype("<i2")
+        return bytes(clipped.tobytes())
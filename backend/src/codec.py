@@ -0,0 +1,84 @@
+"""JSON encoding for the proxy, using the fastest available backend.
+
+orjson is preferred, then msgspec, then the stdlib `json` module. Set
+JSON_CODEC=orjson|msgspec|json to force a backend. Encoding always produces
+UTF-8 bytes, so messages can go straight onto a socket without a str round trip.
+"""
+
+import json
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[str | bytes], Any]
+    decode_error: type[Exception]
+
+
+def _stdlib_codec() -> JsonCodec:
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def dumps(obj: Any) -> bytes:
+        return encoder.encode(obj).encode("utf-8")
+
+    def loads(data: str | bytes) -> Any:
+        try:
+            return json.loads(data)
+        except UnicodeDecodeError as e:
+            # Bytes that are not valid UTF-8 must surface as DecodeError like the other backends
+            raise json.JSONDecodeError(f"Invalid UTF-8: {e.reason}", "", e.start) from e
+
+    return JsonCodec("json", dumps, loads, json.JSONDecodeError)
+
+
+def _orjson_codec() -> JsonCodec | None:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return JsonCodec("orjson", orjson.dumps, orjson.loads, orjson.JSONDecodeError)
+
+
+def _msgspec_codec() -> JsonCodec | None:
+    try:
+        import msgspec  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    return JsonCodec("msgspec", encoder.encode, decoder.decode, msgspec.DecodeError)
+
+
+def available_codecs() -> list[JsonCodec]:
+    """Installed backends, fastest first. The stdlib codec is always last."""
+    codecs = [_orjson_codec(), _msgspec_codec(), _stdlib_codec()]
+    return [codec for codec in codecs if codec is not None]
+
+
+def _select_codec() -> JsonCodec:
+    codecs = available_codecs()
+    requested = os.getenv("JSON_CODEC", "").lower()
+    if requested:
+        for codec in codecs:
+            if codec.name == requested:
+                return codec
+        print(f"[Codec] JSON_CODEC={requested} is not installed, using {codecs[0].name}")
+    return codecs[0]
+
+
+_codec = _select_codec()
+
+BACKEND = _codec.name
+dumps = _codec.dumps
+loads = _codec.loads
+DecodeError = _codec.decode_error
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode to a str, for APIs that only send text frames as str."""
+    return dumps(obj).decode("utf-8")
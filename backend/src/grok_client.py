@@ -2,15 +2,34 @@
 
 import asyncio
 import base64
-import json
-from dataclasses import dataclass
+import hashlib
+import inspect
+import os
+import random
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Callable
+from typing import Any
 
 import websockets
 from websockets.asyncio.client import ClientConnection
 
-XAI_REALTIME_URL = "wss://api.x.ai/v1/realtime"
+from . import codec
+
+# Overridable to point at a stand-in server (see bench/fake_grok_server.py)
+XAI_REALTIME_URL = os.getenv("XAI_REALTIME_URL", "wss://api.x.ai/v1/realtime")
+
+# Grok's native PCM rate; audio at any other rate costs extra samples on the wire
+GROK_NATIVE_SAMPLE_RATE = 24000
+
+# Bounds on function calls whose arguments are still streaming in
+MAX_OPEN_FUNCTION_CALLS = 16
+MAX_FUNCTION_CALL_ARGS_CHARS = 256 * 1024
+
+# Adjacent queued input_audio_buffer.append messages are merged up to this much PCM
+MAX_COALESCED_APPEND_BYTES = 256 * 1024
 
 
 class GrokMessageType(str, Enum):
@@ -20,6 +39,7 @@ class GrokMessageType(str, Enum):
     INPUT_AUDIO_COMMIT = "input_audio_buffer.commit"
     INPUT_AUDIO_CLEAR = "input_audio_buffer.clear"
     CONVERSATION_ITEM_CREATE = "conversation.item.create"
+    CONVERSATION_ITEM_TRUNCATE = "conversation.item.truncate"
     RESPONSE_CREATE = "response.create"
     RESPONSE_CANCEL = "response.cancel"
 
@@ -45,26 +65,160 @@ class GrokMessageType(str, Enum):
     ERROR = "error"
 
 
+class GrokClientEvent(str, Enum):
+    """Events synthesized by GrokVoiceClient on top of the raw Grok messages."""
+
+    READY = "client.ready"  # {}
+    AUDIO = "client.audio"  # the raw audio delta message: {"delta": base64, "item_id": ...}
+    TRANSCRIPT = "client.transcript"  # {"role": "student" | "tutor", "text": ..., "item_id": ...}
+    FUNCTION_CALL = "client.function_call"  # {"call_id": ..., "name": ..., "arguments": {...}}
+    FUNCTION_CALL_ARGS_DELTA = "client.function_call_args_delta"  # {"call_id", "name", "delta"}
+    # A started call that will never complete: {"call_id", "name", "reason"}
+    FUNCTION_CALL_DISCARDED = "client.function_call_discarded"
+    RECONNECTING = "client.reconnecting"  # {"attempt": n, "delay": seconds}
+    RECONNECTED = "client.reconnected"  # {"attempt": n}; session is configured again
+    RECONNECT_FAILED = "client.reconnect_failed"  # {"attempts": n, "error": ...}
+
+
+# High-frequency events that are not logged
+_QUIET_MESSAGE_TYPES = frozenset(
+    {
+        GrokMessageType.RESPONSE_OUTPUT_AUDIO_DELTA.value,
+        GrokMessageType.RESPONSE_OUTPUT_AUDIO_TRANSCRIPT_DELTA.value,
+        GrokMessageType.RESPONSE_FUNCTION_CALL_ARGS_DELTA.value,
+        GrokMessageType.INPUT_AUDIO_APPEND.value,
+    }
+)
+
+# Listener for a raw Grok message type or a GrokClientEvent. It receives the message
+# dict and may return an awaitable, which is awaited before the next Grok message is
+# read (this is how audio consumers apply backpressure).
+Listener = Callable[[dict], Awaitable[None] | None]
+
+
 @dataclass
 class GrokConfig:
     """Configuration for Grok voice session."""
 
     voice: str = "tara"
     instructions: str = ""
-    input_sample_rate: int = 24000
-    output_sample_rate: int = 24000
+    input_sample_rate: int = GROK_NATIVE_SAMPLE_RATE
+    output_sample_rate: int = GROK_NATIVE_SAMPLE_RATE
     turn_detection: str = "server_vad"
     tools: list | None = None  # List of tool definitions for function calling
+    # Content hash of `tools` (see tools_fingerprint). Set it when the tool list is a
+    # constant so the session.update cache doesn't have to hash the tools per connection.
+    tools_version: str | None = None
+    # Uplink batching: accumulate mic audio into larger input_audio_buffer.append messages.
+    # A batch is sent once it reaches input_batch_ms of audio (or input_batch_max_bytes),
+    # or input_batch_deadline_ms after its first chunk. 0 disables batching.
+    input_batch_ms: int = 0
+    input_batch_max_bytes: int = 0
+    input_batch_deadline_ms: int = 40
+    # Send the greeting as soon as the session is configured. Pre-warmed pool
+    # connections turn this off and greet when handed to a student.
+    send_greeting: bool = True
+    # Reconnect after the socket drops unexpectedly, with full-jitter exponential backoff
+    # (delay drawn from [0, min(max_delay, base_delay * 2**attempt)]). 0 disables it.
+    reconnect_attempts: int = 5
+    reconnect_base_delay: float = 0.5
+    reconnect_max_delay: float = 8.0
+    reconnect_ready_timeout: float = 15.0
+    # Outbound messages waiting for the writer task. Senders wait when it is full,
+    # which is how a slow upstream socket pushes back on the proxy.
+    outbound_queue_size: int = 256
+
+
+# Serialized session.update messages, shared by every client with the same settings
+_session_update_cache: dict[tuple, bytes] = {}
+_SESSION_UPDATE_CACHE_MAX = 32
+
+
+def tools_fingerprint(tools: list | None) -> str:
+    """Short content hash of a tool list, for GrokConfig.tools_version."""
+    return hashlib.sha256(codec.dumps(tools or [])).hexdigest()[:16]
+
+
+def build_session_update(config: GrokConfig) -> bytes:
+    """Serialized session.update message for `config`.
+
+    The instructions and tool schemas are the bulk of the message and are the same
+    for every student, so each distinct setup is serialized once and reused.
+    """
+    key = (
+        config.voice,
+        config.instructions,
+        config.input_sample_rate,
+        config.output_sample_rate,
+        config.turn_detection,
+        config.tools_version or tools_fingerprint(config.tools),
+    )
+    payload = _session_update_cache.get(key)
+    if payload is not None:
+        return payload
+
+    session = {
+        "instructions": config.instructions,
+        "voice": config.voice,
+        "audio": {
+            "input": {
+                "format": {
+                    "type": "audio/pcm",
+                    "rate": config.input_sample_rate,
+                },
+            },
+            "output": {
+                "format": {
+                    "type": "audio/pcm",
+                    "rate": config.output_sample_rate,
+                },
+            },
+        },
+        "turn_detection": {
+            "type": config.turn_detection,
+        },
+        "input_audio_transcription": {
+            "model": "grok-2-public",
+        },
+    }
+
+    # Add tools if provided
+    if config.tools:
+        session["tools"] = config.tools
+
+    payload = codec.dumps({"type": GrokMessageType.SESSION_UPDATE.value, "session": session})
+    if len(_session_update_cache) >= _SESSION_UPDATE_CACHE_MAX:
+        _session_update_cache.clear()
+    _session_update_cache[key] = payload
+    return payload
+
+
+@dataclass
+class PendingFunctionCall:
+    """A function call whose argument deltas are still arriving."""
+
+    call_id: str
+    name: str
+    parts: list[str] = field(default_factory=list)
+    size: int = 0
+    overflowed: bool = False  # Arguments exceeded MAX_FUNCTION_CALL_ARGS_CHARS
 
 
 class GrokVoiceClient:
-    """Client for Grok's realtime voice API."""
+    """Client for Grok's realtime voice API.
+
+    Consumers subscribe with `add_listener()` to raw Grok message types
+    (GrokMessageType values) or to the GrokClientEvent events the client builds
+    from them. The `on_*` constructor arguments are shorthands that register
+    listeners.
+    """
 
     def __init__(
         self,
         api_key: str,
         config: GrokConfig,
-        on_audio: Callable[[bytes], None] | None = None,
+        on_audio: Callable[[bytes], Awaitable[None] | None] | None = None,
+        on_audio_b64: Callable[[str], Awaitable[None] | None] | None = None,
         on_transcript: Callable[[str, str], None] | None = None,
         on_speech_started: Callable[[], None] | None = None,
         on_speech_stopped: Callable[[], None] | None = None,
@@ -76,23 +230,124 @@ class GrokVoiceClient:
     ):
         self.api_key = api_key
         self.config = config
-        self.on_audio = on_audio
-        self.on_transcript = on_transcript
-        self.on_speech_started = on_speech_started
-        self.on_speech_stopped = on_speech_stopped
-        self.on_response_started = on_response_started
-        self.on_response_done = on_response_done
-        self.on_error = on_error
-        self.on_ready = on_ready
-        self.on_function_call = on_function_call
+
+        # Built-in handling per Grok message type, looked up once per message
+        self._dispatch: dict[str, Callable[[dict], Awaitable[None]]] = {
+            GrokMessageType.CONVERSATION_CREATED.value: self._on_conversation_created,
+            GrokMessageType.SESSION_UPDATED.value: self._on_session_updated,
+            GrokMessageType.INPUT_AUDIO_TRANSCRIPTION_COMPLETED.value: self._on_input_transcription,
+            GrokMessageType.RESPONSE_CREATED.value: self._on_response_created,
+            GrokMessageType.RESPONSE_OUTPUT_AUDIO_DELTA.value: self._on_audio_delta,
+            GrokMessageType.RESPONSE_OUTPUT_AUDIO_TRANSCRIPT_DELTA.value: self._on_transcript_delta,
+            GrokMessageType.RESPONSE_OUTPUT_AUDIO_TRANSCRIPT_DONE.value: self._on_transcript_done,
+            GrokMessageType.RESPONSE_OUTPUT_ITEM_ADDED.value: self._on_output_item_added,
+            GrokMessageType.RESPONSE_FUNCTION_CALL_ARGS_DELTA.value: self._on_function_args_delta,
+            GrokMessageType.RESPONSE_FUNCTION_CALL_ARGS_DONE.value: self._on_function_args_done,
+            GrokMessageType.RESPONSE_DONE.value: self._on_response_done,
+            GrokMessageType.ERROR.value: self._on_error_message,
+        }
+        self._listeners: defaultdict[str, list[Listener]] = defaultdict(list)
+        self._register_callbacks(
+            on_audio=on_audio,
+            on_audio_b64=on_audio_b64,
+            on_transcript=on_transcript,
+            on_speech_started=on_speech_started,
+            on_speech_stopped=on_speech_stopped,
+            on_response_started=on_response_started,
+            on_response_done=on_response_done,
+            on_error=on_error,
+            on_ready=on_ready,
+            on_function_call=on_function_call,
+        )
 
         self._ws: ClientConnection | None = None
         self._connected = False
         self._session_configured = False
         self._receive_task: asyncio.Task | None = None
-        self._current_transcript = ""
-        self._current_function_call: dict | None = None  # Track current function call
-        self._function_call_args = ""  # Accumulate function call arguments
+        self._reconnect_task: asyncio.Task | None = None
+        self._resuming = False  # Reconnecting a session that was already in use
+        # Readiness: set once the session is configured (or the handshake failed)
+        self._ready_event = asyncio.Event()
+        self._ready_error: str | None = None
+        self._connect_started: float = 0.0
+        self.handshake_seconds: float | None = None  # connect() -> session ready
+        self._input_batch = bytearray()  # Pending uplink PCM16 (when batching is enabled)
+        self._input_batch_flush_task: asyncio.Task | None = None
+        self._transcript_parts: list[str] = []  # Tutor transcript deltas for the current response
+        self._current_audio_item_id: str | None = None  # Assistant item currently producing audio
+        self._audio_suppressed = False  # Drop late audio deltas after a cancel
+        # Function calls being streamed, keyed by item id (call id if the item has none).
+        # Parallel calls can interleave their argument deltas.
+        self._function_calls: dict[str, PendingFunctionCall] = {}
+        # Everything sent to Grok goes through one queue and one writer task, so
+        # concurrent senders never interleave and bursts can be coalesced
+        self._outbox: asyncio.Queue[dict | bytes] = asyncio.Queue(config.outbound_queue_size)
+        self._writer_task: asyncio.Task | None = None
+        self.frames_sent = 0
+        self.frames_coalesced = 0  # Messages merged into another or dropped as duplicates
+
+    def add_listener(self, event_type: str, listener: Listener) -> Callable[[], None]:
+        """Subscribe to a Grok message type or GrokClientEvent. Returns an unsubscribe function."""
+        event_type = getattr(event_type, "value", event_type)
+        self._listeners[event_type].append(listener)
+
+        def remove() -> None:
+            if listener in self._listeners[event_type]:
+                self._listeners[event_type].remove(listener)
+
+        return remove
+
+    def _register_callbacks(
+        self,
+        on_audio: Callable[[bytes], Awaitable[None] | None] | None,
+        on_audio_b64: Callable[[str], Awaitable[None] | None] | None,
+        on_transcript: Callable[[str, str], None] | None,
+        on_speech_started: Callable[[], None] | None,
+        on_speech_stopped: Callable[[], None] | None,
+        on_response_started: Callable[[], None] | None,
+        on_response_done: Callable[[], None] | None,
+        on_error: Callable[[str, str], None] | None,
+        on_ready: Callable[[], None] | None,
+        on_function_call: Callable[[str, str, dict], None] | None,
+    ) -> None:
+        """Adapt the constructor's positional-style callbacks to listeners."""
+        if on_audio_b64:
+            self.add_listener(GrokClientEvent.AUDIO, lambda m: on_audio_b64(m["delta"]))
+        elif on_audio:
+            self.add_listener(
+                GrokClientEvent.AUDIO, lambda m: on_audio(base64.b64decode(m["delta"]))
+            )
+        if on_transcript:
+            self.add_listener(
+                GrokClientEvent.TRANSCRIPT, lambda m: on_transcript(m["role"], m["text"])
+            )
+        if on_speech_started:
+            self.add_listener(
+                GrokMessageType.INPUT_AUDIO_SPEECH_STARTED, lambda m: on_speech_started()
+            )
+        if on_speech_stopped:
+            self.add_listener(
+                GrokMessageType.INPUT_AUDIO_SPEECH_STOPPED, lambda m: on_speech_stopped()
+            )
+        if on_response_started:
+            self.add_listener(GrokMessageType.RESPONSE_CREATED, lambda m: on_response_started())
+        if on_response_done:
+            self.add_listener(GrokMessageType.RESPONSE_DONE, lambda m: on_response_done())
+        if on_error:
+            self.add_listener(
+                GrokMessageType.ERROR,
+                lambda m: on_error(
+                    m.get("error", {}).get("code", "unknown"),
+                    m.get("error", {}).get("message", "Unknown error"),
+                ),
+            )
+        if on_ready:
+            self.add_listener(GrokClientEvent.READY, lambda m: on_ready())
+        if on_function_call:
+            self.add_listener(
+                GrokClientEvent.FUNCTION_CALL,
+                lambda m: on_function_call(m["call_id"], m["name"], m["arguments"]),
+            )
 
     @property
     def is_connected(self) -> bool:
@@ -102,6 +357,10 @@ class GrokVoiceClient:
     def is_ready(self) -> bool:
         return self._connected and self._session_configured
 
+    @property
+    def current_audio_item_id(self) -> str | None:
+        return self._current_audio_item_id
+
     async def connect(self) -> None:
         """Connect to Grok's realtime API."""
         if self._connected:
@@ -115,6 +374,11 @@ class GrokVoiceClient:
 
         print(f"[Grok] Connecting to {XAI_REALTIME_URL}...")
 
+        self._ready_event.clear()
+        self._ready_error = None
+        self.handshake_seconds = None
+        self._connect_started = time.monotonic()
+
         self._ws = await websockets.connect(
             XAI_REALTIME_URL,
             additional_headers=headers,
@@ -122,28 +386,120 @@ class GrokVoiceClient:
         )
         self._connected = True
         self._session_configured = False
+        self._outbox = asyncio.Queue(self.config.outbound_queue_size)
+        self._writer_task = asyncio.create_task(self._writer_loop(self._ws, self._outbox))
 
         print("[Grok] Connected, waiting for conversation.created...")
 
         # Start receiving messages
         self._receive_task = asyncio.create_task(self._receive_loop())
 
+    @property
+    def is_reconnecting(self) -> bool:
+        return self._reconnect_task is not None and not self._reconnect_task.done()
+
     async def disconnect(self) -> None:
         """Disconnect from Grok's API."""
+        if self._reconnect_task and self._reconnect_task is not asyncio.current_task():
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+            self._reconnect_task = None
+
+        await self._close_socket()
+
+    async def _close_socket(self) -> None:
+        """Tear down the current socket and per-connection state."""
         self._connected = False
         self._session_configured = False
+        self._fail_ready("disconnected")
+        self._cancel_input_batch_flush()
+        self._input_batch.clear()
+        self._function_calls.clear()
 
-        if self._receive_task:
-            self._receive_task.cancel()
+        if self._writer_task:
+            self._writer_task.cancel()
             try:
-                await self._receive_task
+                await self._writer_task
             except asyncio.CancelledError:
                 pass
+            self._writer_task = None
+
+        if self._receive_task:
+            if self._receive_task is not asyncio.current_task():
+                self._receive_task.cancel()
+                try:
+                    await self._receive_task
+                except asyncio.CancelledError:
+                    pass
             self._receive_task = None
 
         if self._ws:
-            await self._ws.close()
-            self._ws = None
+            ws, self._ws = self._ws, None
+            await ws.close()
+
+    async def _reconnect(self) -> None:
+        """Re-open a dropped session: backoff, connect, re-configure, notify listeners.
+
+        The session config is re-sent as part of the normal handshake. No greeting is
+        sent; RECONNECTED listeners replay whatever history the new session needs.
+        """
+        await self._close_socket()
+        attempts = self.config.reconnect_attempts
+        error = ""
+        for attempt in range(1, attempts + 1):
+            backoff = self.config.reconnect_base_delay * 2 ** (attempt - 1)
+            delay = random.uniform(0, min(self.config.reconnect_max_delay, backoff))
+            print(f"[Grok] Reconnecting in {delay:.2f}s (attempt {attempt}/{attempts})")
+            await self._emit(
+                GrokClientEvent.RECONNECTING.value, {"attempt": attempt, "delay": delay}
+            )
+            await asyncio.sleep(delay)
+
+            self._resuming = True
+            try:
+                await self.connect()
+                await self.wait_until_ready(timeout=self.config.reconnect_ready_timeout)
+            except (OSError, TimeoutError, websockets.exceptions.WebSocketException) as e:
+                error = f"{type(e).__name__}: {e}"
+                print(f"[Grok] Reconnect attempt {attempt} failed: {error}")
+                await self._close_socket()
+                continue
+            finally:
+                self._resuming = False
+
+            print(f"[Grok] Reconnected after {attempt} attempt(s)")
+            await self._emit(GrokClientEvent.RECONNECTED.value, {"attempt": attempt})
+            return
+
+        print(f"[Grok] Giving up after {attempts} reconnect attempt(s)")
+        await self._emit(
+            GrokClientEvent.RECONNECT_FAILED.value, {"attempts": attempts, "error": error}
+        )
+
+    async def wait_until_ready(self, timeout: float | None = None) -> float:
+        """Wait until the session is configured and return how long we waited.
+
+        Raises TimeoutError if `timeout` seconds pass first, or ConnectionError if
+        Grok reported an error or the connection closed during the handshake.
+        """
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._ready_event.wait(), timeout=timeout)
+        except TimeoutError:
+            raise TimeoutError(f"Grok session not ready after {timeout:.1f}s") from None
+
+        if self._ready_error:
+            raise ConnectionError(f"Grok session failed to start: {self._ready_error}")
+        return time.monotonic() - start
+
+    def _fail_ready(self, reason: str) -> None:
+        """Wake readiness waiters with an error if the handshake hasn't finished."""
+        if not self._ready_event.is_set():
+            self._ready_error = reason
+            self._ready_event.set()
 
     async def _configure_session(self) -> None:
         """Configure the Grok session with voice settings and instructions."""
@@ -151,46 +507,13 @@ class GrokVoiceClient:
             raise RuntimeError("Not connected to Grok API")
 
         print(f"[Grok] Configuring session with {self.config.input_sample_rate}Hz audio...")
-
-        session = {
-            "instructions": self.config.instructions,
-            "voice": self.config.voice,
-            "audio": {
-                "input": {
-                    "format": {
-                        "type": "audio/pcm",
-                        "rate": self.config.input_sample_rate,
-                    },
-                },
-                "output": {
-                    "format": {
-                        "type": "audio/pcm",
-                        "rate": self.config.output_sample_rate,
-                    },
-                },
-            },
-            "turn_detection": {
-                "type": self.config.turn_detection,
-            },
-            "input_audio_transcription": {
-                "model": "grok-2-public",
-            },
-        }
-
-        # Add tools if provided
         if self.config.tools:
-            session["tools"] = self.config.tools
             print(f"[Grok] Registering {len(self.config.tools)} tools")
 
-        session_config = {
-            "type": GrokMessageType.SESSION_UPDATE.value,
-            "session": session,
-        }
-
-        await self._ws.send(json.dumps(session_config))
+        await self._send_bytes(build_session_update(self.config))
         print("[Grok] Waiting for session.updated confirmation...")
 
-    async def _send_initial_greeting(self) -> None:
+    async def send_initial_greeting(self) -> None:
         """Send initial greeting after session is configured."""
         if not self._ws:
             return
@@ -198,7 +521,7 @@ class GrokVoiceClient:
         print("[Grok] Session configured, sending initial greeting...")
 
         # Commit any pending audio buffer first
-        await self._ws.send(json.dumps({"type": GrokMessageType.INPUT_AUDIO_COMMIT.value}))
+        await self._send({"type": GrokMessageType.INPUT_AUDIO_COMMIT.value})
 
         # Create greeting message
         greeting = {
@@ -214,13 +537,23 @@ class GrokVoiceClient:
                 ],
             },
         }
-        await self._ws.send(json.dumps(greeting))
+        await self._send(greeting)
 
         # Request response
-        await self._ws.send(json.dumps({"type": GrokMessageType.RESPONSE_CREATE.value}))
+        await self._send({"type": GrokMessageType.RESPONSE_CREATE.value})
 
         print("[Grok] Ready for voice interaction")
 
+    @property
+    def _input_batch_target_bytes(self) -> int:
+        """Uplink batch size in bytes, or 0 if batching is disabled."""
+        targets = []
+        if self.config.input_batch_ms > 0:
+            targets.append(self.config.input_sample_rate * 2 * self.config.input_batch_ms // 1000)
+        if self.config.input_batch_max_bytes > 0:
+            targets.append(self.config.input_batch_max_bytes)
+        return min(targets) if targets else 0
+
     async def send_audio(self, audio_b64: str) -> None:
         """Send audio data to Grok (base64 PCM16)."""
         if not self._ws:
@@ -228,28 +561,156 @@ class GrokVoiceClient:
         if not self._session_configured:
             return
 
+        # Chunks that are already a full batch skip the decode/re-encode entirely
+        target = self._input_batch_target_bytes
+        if target and (self._input_batch or len(audio_b64) * 3 // 4 < target):
+            await self.send_audio_bytes(base64.b64decode(audio_b64))
+            return
+
+        await self._send_audio_append(audio_b64)
+
+    async def send_audio_bytes(self, pcm: bytes) -> None:
+        """Send raw PCM16 audio to Grok, batching small chunks when configured."""
+        if not self._ws:
+            return
+        if not self._session_configured:
+            return
+
+        target = self._input_batch_target_bytes
+        if not target:
+            await self._send_audio_append(base64.b64encode(pcm).decode("ascii"))
+            return
+
+        self._input_batch += pcm
+        if len(self._input_batch) >= target:
+            await self.flush_audio()
+        elif self._input_batch_flush_task is None:
+            self._input_batch_flush_task = asyncio.create_task(self._flush_audio_after_deadline())
+
+    async def flush_audio(self) -> None:
+        """Send any batched uplink audio immediately."""
+        self._cancel_input_batch_flush()
+        if not self._input_batch or not self._ws:
+            return
+
+        audio_b64 = base64.b64encode(self._input_batch).decode("ascii")
+        self._input_batch.clear()
+        await self._send_audio_append(audio_b64)
+
+    async def _flush_audio_after_deadline(self) -> None:
+        """Flush a partial batch so quiet trickles of audio aren't held back."""
+        await asyncio.sleep(self.config.input_batch_deadline_ms / 1000)
+        self._input_batch_flush_task = None
+        await self.flush_audio()
+
+    def _cancel_input_batch_flush(self) -> None:
+        if self._input_batch_flush_task:
+            self._input_batch_flush_task.cancel()
+            self._input_batch_flush_task = None
+
+    async def _send(self, msg: dict | bytes) -> None:
+        """Queue a message (or already-encoded JSON bytes) for the writer task.
+
+        Waits while the queue is full. Messages are dropped when there is no live
+        connection to send them on.
+        """
+        if not self._ws or self._writer_task is None or self._writer_task.done():
+            return
+        await self._outbox.put(msg)
+
+    async def _send_bytes(self, payload: bytes) -> None:
+        """Queue an already-encoded JSON message."""
+        await self._send(payload)
+
+    async def _writer_loop(self, ws: ClientConnection, outbox: asyncio.Queue) -> None:
+        """Send queued messages in order, coalescing whatever has piled up."""
+        try:
+            while True:
+                batch = [await outbox.get()]
+                while not outbox.empty():
+                    batch.append(outbox.get_nowait())
+                frames = self._coalesce(batch)
+                self.frames_coalesced += len(batch) - len(frames)
+                for frame in frames:
+                    payload = frame if isinstance(frame, bytes) else codec.dumps(frame)
+                    # ws.send waits for the socket to drain, so a slow upstream
+                    # backs up the queue and then the senders
+                    await ws.send(payload, text=True)
+                    self.frames_sent += 1
+        except websockets.exceptions.ConnectionClosed:
+            # The receive loop sees the close too and takes care of reconnecting
+            pass
+        except Exception as e:
+            # Without a writer every later send is dropped while the session still
+            # looks connected. Close the socket so the receive loop resumes it.
+            print(f"[Grok] Writer failed, closing the connection: {type(e).__name__}: {e}")
+            await ws.close(code=1011, reason="Client writer failed")
+        finally:
+            # Release any senders still waiting on a full queue
+            while not outbox.empty():
+                outbox.get_nowait()
+
+    @staticmethod
+    def _coalesce(batch: list[dict | bytes]) -> list[dict | bytes]:
+        """Merge runs of audio appends and drop back-to-back response.create requests.
+
+        Grok takes one event per frame, so this is the only safe way to send fewer
+        frames: appends concatenate, and a repeated bare response.create asks for a
+        response that is already requested.
+        """
+        append = GrokMessageType.INPUT_AUDIO_APPEND.value
+        out: list[dict | bytes] = []
+        pcm: bytearray | None = None  # Decoded audio of a run of appends, once it has 2+
+        for msg in batch:
+            prev = out[-1] if out else None
+            if isinstance(msg, dict) and isinstance(prev, dict):
+                if msg["type"] == append and prev["type"] == append:
+                    if pcm is None:
+                        pcm = bytearray(base64.b64decode(prev["audio"]))
+                    chunk = base64.b64decode(msg["audio"])
+                    if len(pcm) + len(chunk) <= MAX_COALESCED_APPEND_BYTES:
+                        pcm += chunk
+                        continue
+                    out[-1] = {"type": append, "audio": base64.b64encode(pcm).decode("ascii")}
+                    pcm = None
+                elif msg == prev == {"type": GrokMessageType.RESPONSE_CREATE.value}:
+                    continue
+            if pcm is not None:
+                out[-1] = {"type": append, "audio": base64.b64encode(pcm).decode("ascii")}
+                pcm = None
+            out.append(msg)
+        if pcm is not None:
+            out[-1] = {"type": append, "audio": base64.b64encode(pcm).decode("ascii")}
+        return out
+
+    async def _send_audio_append(self, audio_b64: str) -> None:
         msg = {
             "type": GrokMessageType.INPUT_AUDIO_APPEND.value,
             "audio": audio_b64,
         }
-        await self._ws.send(json.dumps(msg))
+        await self._send(msg)
 
     async def commit_audio(self) -> None:
         """Commit the audio buffer to signal end of user speech."""
         if not self._ws:
             return
 
+        # Batched audio must reach Grok before the commit
+        await self.flush_audio()
+
         print("[Grok] Committing audio buffer")
         msg = {"type": GrokMessageType.INPUT_AUDIO_COMMIT.value}
-        await self._ws.send(json.dumps(msg))
+        await self._send(msg)
 
     async def clear_audio_buffer(self) -> None:
         """Clear the input audio buffer."""
         if not self._ws:
             return
 
+        self._cancel_input_batch_flush()
+        self._input_batch.clear()
         msg = {"type": GrokMessageType.INPUT_AUDIO_CLEAR.value}
-        await self._ws.send(json.dumps(msg))
+        await self._send(msg)
 
     async def send_text_message(self, text: str, role: str = "user") -> None:
         """Send a text message to Grok."""
@@ -269,7 +730,7 @@ class GrokVoiceClient:
                 ],
             },
         }
-        await self._ws.send(json.dumps(msg))
+        await self._send(msg)
 
     async def request_response(self) -> None:
         """Request Grok to generate a response."""
@@ -277,15 +738,35 @@ class GrokVoiceClient:
             return
 
         msg = {"type": GrokMessageType.RESPONSE_CREATE.value}
-        await self._ws.send(json.dumps(msg))
+        await self._send(msg)
 
     async def cancel_response(self) -> None:
         """Cancel the current response (for interruptions)."""
         if not self._ws:
             return
 
+        # Audio already in flight for the cancelled response should not be played
+        self._audio_suppressed = True
         msg = {"type": GrokMessageType.RESPONSE_CANCEL.value}
-        await self._ws.send(json.dumps(msg))
+        await self._send(msg)
+
+    async def truncate_item(self, item_id: str, audio_end_ms: int, content_index: int = 0) -> None:
+        """Truncate an assistant item's audio to what the student actually heard.
+
+        Keeps Grok's record of the conversation in line with an interrupted reply,
+        so it doesn't assume the student heard the rest.
+        """
+        if not self._ws:
+            return
+
+        print(f"[Grok] Truncating item {item_id} at {audio_end_ms}ms")
+        msg = {
+            "type": GrokMessageType.CONVERSATION_ITEM_TRUNCATE.value,
+            "item_id": item_id,
+            "content_index": content_index,
+            "audio_end_ms": audio_end_ms,
+        }
+        await self._send(msg)
 
     async def inject_context(self, context: str) -> None:
         """Inject context (like canvas state) as a system message."""
@@ -305,7 +786,7 @@ class GrokVoiceClient:
                 ],
             },
         }
-        await self._ws.send(json.dumps(msg))
+        await self._send(msg)
 
     async def send_function_result(self, call_id: str, result: str, request_response: bool = True) -> None:
         """Send the result of a function call back to Grok.
@@ -334,11 +815,11 @@ class GrokVoiceClient:
                 "output": result,
             },
         }
-        await self._ws.send(json.dumps(msg))
+        await self._send(msg)
 
         # Only request response if this is the last function result in a batch
         if request_response:
-            await self._ws.send(json.dumps({"type": GrokMessageType.RESPONSE_CREATE.value}))
+            await self._send({"type": GrokMessageType.RESPONSE_CREATE.value})
 
     async def _receive_loop(self) -> None:
         """Receive and process messages from Grok."""
@@ -346,131 +827,227 @@ class GrokVoiceClient:
             return
 
         try:
-            async for raw_message in self._ws:
+            while self._connected:
+                # Undecoded bytes: the JSON codec reads UTF-8 directly
+                raw_message = await self._ws.recv(decode=False)
                 if not self._connected:
                     break
 
                 try:
-                    message = json.loads(raw_message)
-                    await self._handle_message(message)
-                except json.JSONDecodeError:
-                    print(f"[Grok] Failed to parse message: {raw_message}")
+                    message = codec.loads(raw_message)
+                except codec.DecodeError:
+                    print(f"[Grok] Failed to parse message: {raw_message[:200]!r}")
+                    continue
+                await self._handle_message(message)
 
+            self._fail_ready("disconnected")
         except websockets.exceptions.ConnectionClosed as e:
             print(f"[Grok] Connection closed: {e}")
+            # Only sessions that were up and not closed by us are worth resuming
+            should_reconnect = self._connected and self._session_configured
             self._connected = False
+            self._fail_ready(f"connection closed: {e}")
+            if should_reconnect and self.config.reconnect_attempts > 0:
+                self._reconnect_task = asyncio.create_task(self._reconnect())
         except asyncio.CancelledError:
             pass
+        except Exception as e:
+            # A failing handler or listener would otherwise end this task silently,
+            # leaving a session that looks connected but never reads again
+            print(f"[Grok] Receive loop failed: {type(e).__name__}: {e}")
+            should_reconnect = self._connected and self._session_configured
+            self._connected = False
+            self._fail_ready(f"receive loop failed: {e}")
+            if should_reconnect and self.config.reconnect_attempts > 0:
+                self._reconnect_task = asyncio.create_task(self._reconnect())
+            elif self._ws:
+                await self._ws.close(code=1011, reason="Client receive loop failed")
 
     async def _handle_message(self, message: dict) -> None:
-        """Handle a message from Grok."""
+        """Handle a message from Grok: built-in handling first, then listeners."""
         msg_type = message.get("type", "")
 
-        # Log non-audio events
-        if msg_type not in [
-            GrokMessageType.RESPONSE_OUTPUT_AUDIO_DELTA.value,
-            GrokMessageType.INPUT_AUDIO_APPEND.value,
-        ]:
+        if msg_type not in _QUIET_MESSAGE_TYPES:
             print(f"[Grok] Received: {msg_type}")
 
-        if msg_type == GrokMessageType.CONVERSATION_CREATED.value:
-            # Conversation created, configure the session
-            await self._configure_session()
-
-        elif msg_type == GrokMessageType.SESSION_UPDATED.value:
-            # Session configured, now ready for interaction
-            self._session_configured = True
-            await self._send_initial_greeting()
-            if self.on_ready:
-                self.on_ready()
-
-        elif msg_type == GrokMessageType.INPUT_AUDIO_SPEECH_STARTED.value:
-            print("[Grok] Speech started (VAD detected)")
-            if self.on_speech_started:
-                self.on_speech_started()
-
-        elif msg_type == GrokMessageType.INPUT_AUDIO_SPEECH_STOPPED.value:
-            print("[Grok] Speech stopped (VAD detected)")
-            if self.on_speech_stopped:
-                self.on_speech_stopped()
-
-        elif msg_type == GrokMessageType.INPUT_AUDIO_TRANSCRIPTION_COMPLETED.value:
-            # User's speech transcript
-            transcript = message.get("transcript", "")
-            if transcript and self.on_transcript:
-                print(f"[Grok] User transcript: {transcript}")
-                self.on_transcript("student", transcript)
-
-        elif msg_type == GrokMessageType.RESPONSE_CREATED.value:
-            self._current_transcript = ""
-            self._current_function_call = None
-            self._function_call_args = ""
-            if self.on_response_started:
-                self.on_response_started()
-
-        elif msg_type == GrokMessageType.RESPONSE_OUTPUT_AUDIO_DELTA.value:
-            # Audio chunk from Grok
-            audio_b64 = message.get("delta", "")
-            if audio_b64 and self.on_audio:
-                audio_bytes = base64.b64decode(audio_b64)
-                self.on_audio(audio_bytes)
-
-        elif msg_type == GrokMessageType.RESPONSE_OUTPUT_AUDIO_TRANSCRIPT_DELTA.value:
-            # Transcript chunk from Grok
-            delta = message.get("delta", "")
-            self._current_transcript += delta
-
-        elif msg_type == GrokMessageType.RESPONSE_OUTPUT_AUDIO_TRANSCRIPT_DONE.value:
-            # Full transcript available
-            if self._current_transcript and self.on_transcript:
-                self.on_transcript("tutor", self._current_transcript)
-            self._current_transcript = ""
-
-        elif msg_type == GrokMessageType.RESPONSE_OUTPUT_ITEM_ADDED.value:
-            # Check if this is a function call item
-            item = message.get("item", {})
-            if item.get("type") == "function_call":
-                self._current_function_call = {
-                    "call_id": item.get("call_id"),
-                    "name": item.get("name"),
-                }
-                self._function_call_args = ""
-                print(f"[Grok] Function call started: {item.get('name')}")
-
-        elif msg_type == GrokMessageType.RESPONSE_FUNCTION_CALL_ARGS_DELTA.value:
-            # Accumulate function call arguments
-            delta = message.get("delta", "")
-            self._function_call_args += delta
-
-        elif msg_type == GrokMessageType.RESPONSE_FUNCTION_CALL_ARGS_DONE.value:
-            # Function call arguments complete
-            if self._current_function_call and self.on_function_call:
-                try:
-                    args = json.loads(self._function_call_args) if self._function_call_args else {}
-                    func_name = self._current_function_call["name"]
-                    call_id = self._current_function_call["call_id"]
-                    print(f"[Grok] Function call complete: {func_name} with args: {args}")
-
-                    # For check_canvas, we need to cancel the response immediately
-                    # to prevent Grok from speaking "I don't see your answer" while we analyze
-                    if func_name == "check_canvas":
-                        print("[Grok] Cancelling response to wait for vision analysis...")
-                        await self.cancel_response()
-
-                    self.on_function_call(call_id, func_name, args)
-                except json.JSONDecodeError as e:
-                    print(f"[Grok] Failed to parse function args: {e}")
-            self._current_function_call = None
-            self._function_call_args = ""
-
-        elif msg_type == GrokMessageType.RESPONSE_DONE.value:
-            if self.on_response_done:
-                self.on_response_done()
-
-        elif msg_type == GrokMessageType.ERROR.value:
-            error = message.get("error", {})
-            error_code = error.get("code", "unknown")
-            error_message = error.get("message", "Unknown error")
-            print(f"[Grok Error] {error_code}: {error_message}")
-            if self.on_error:
-                self.on_error(error_code, error_message)
+        handler = self._dispatch.get(msg_type)
+        if handler:
+            await handler(message)
+
+        if msg_type in self._listeners:
+            await self._emit(msg_type, message)
+
+    async def _emit(self, event_type: str, message: dict) -> None:
+        """Call the listeners for an event, awaiting any that return an awaitable."""
+        for listener in self._listeners.get(event_type, ()):
+            result: Any = listener(message)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _on_conversation_created(self, message: dict) -> None:
+        # Conversation created, configure the session
+        await self._configure_session()
+
+    async def _on_session_updated(self, message: dict) -> None:
+        # Session configured, now ready for interaction
+        self._session_configured = True
+        if self.config.send_greeting and not self._resuming:
+            await self.send_initial_greeting()
+        if not self._ready_event.is_set():
+            self.handshake_seconds = time.monotonic() - self._connect_started
+            print(f"[Grok] Session ready after {self.handshake_seconds * 1000:.0f}ms")
+        self._ready_event.set()
+        await self._emit(GrokClientEvent.READY.value, {})
+
+    async def _on_input_transcription(self, message: dict) -> None:
+        # User's speech transcript
+        transcript = message.get("transcript", "")
+        if transcript:
+            print(f"[Grok] User transcript: {transcript}")
+            await self._emit(
+                GrokClientEvent.TRANSCRIPT.value,
+                {"role": "student", "text": transcript, "item_id": message.get("item_id")},
+            )
+
+    async def _on_response_created(self, message: dict) -> None:
+        self._transcript_parts.clear()
+        self._current_audio_item_id = None
+        self._audio_suppressed = False
+
+    async def _on_audio_delta(self, message: dict) -> None:
+        # Audio chunk from Grok - listeners get the base64 delta as-is
+        if message.get("delta") and not self._audio_suppressed:
+            self._current_audio_item_id = message.get("item_id", self._current_audio_item_id)
+            await self._emit(GrokClientEvent.AUDIO.value, message)
+
+    async def _on_transcript_delta(self, message: dict) -> None:
+        # Transcript chunk from Grok
+        self._transcript_parts.append(message.get("delta", ""))
+
+    async def _on_transcript_done(self, message: dict) -> None:
+        # Full transcript available
+        transcript = "".join(self._transcript_parts)
+        self._transcript_parts.clear()
+        if transcript:
+            await self._emit(
+                GrokClientEvent.TRANSCRIPT.value,
+                {"role": "tutor", "text": transcript, "item_id": message.get("item_id")},
+            )
+
+    async def _on_output_item_added(self, message: dict) -> None:
+        # Check if this is a function call item
+        item = message.get("item", {})
+        if item.get("type") == "function_call":
+            key = item.get("id") or item.get("call_id") or ""
+            if len(self._function_calls) >= MAX_OPEN_FUNCTION_CALLS:
+                stale_key = next(iter(self._function_calls))
+                stale = self._function_calls.pop(stale_key)
+                print(
+                    f"[Grok] Too many open function calls, "
+                    f"dropping {stale.name} ({stale.call_id})"
+                )
+                await self._discard_function_call(stale, "too many open calls")
+            self._function_calls[key] = PendingFunctionCall(
+                call_id=item.get("call_id"),
+                name=item.get("name"),
+            )
+            print(f"[Grok] Function call started: {item.get('name')}")
+
+    def _find_function_call(self, message: dict) -> str | None:
+        """Key of the open function call an arguments message belongs to."""
+        item_id = message.get("item_id")
+        if item_id in self._function_calls:
+            return item_id
+        call_id = message.get("call_id")
+        if call_id:
+            for key, call in self._function_calls.items():
+                if call.call_id == call_id:
+                    return key
+        if not item_id and not call_id and len(self._function_calls) == 1:
+            # No ids on the message: only unambiguous with a single open call
+            return next(iter(self._function_calls))
+        return None
+
+    async def _on_function_args_delta(self, message: dict) -> None:
+        # Accumulate function call arguments per call
+        key = self._find_function_call(message)
+        if key is None:
+            return
+        call = self._function_calls[key]
+        if call.overflowed:
+            return
+
+        delta = message.get("delta", "")
+        call.size += len(delta)
+        if call.size > MAX_FUNCTION_CALL_ARGS_CHARS:
+            print(f"[Grok] Arguments for {call.name} exceed {MAX_FUNCTION_CALL_ARGS_CHARS} chars")
+            call.overflowed = True
+            call.parts.clear()
+            return
+        call.parts.append(delta)
+
+        event = GrokClientEvent.FUNCTION_CALL_ARGS_DELTA.value
+        if event in self._listeners:
+            await self._emit(event, {"call_id": call.call_id, "name": call.name, "delta": delta})
+
+    async def _on_function_args_done(self, message: dict) -> None:
+        # Function call arguments complete
+        key = self._find_function_call(message)
+        if key is None:
+            return
+        call = self._function_calls.pop(key)
+
+        # The done message carries the full arguments; the deltas are the fallback
+        raw_args = message.get("arguments")
+        if raw_args is None:
+            if call.overflowed:
+                print(f"[Grok] Dropping {call.name} call with oversized arguments")
+                await self._discard_function_call(call, "arguments too large")
+                return
+            raw_args = "".join(call.parts)
+
+        try:
+            args = codec.loads(raw_args) if raw_args else {}
+        except codec.DecodeError as e:
+            print(f"[Grok] Failed to parse function args: {e}")
+            await self._discard_function_call(call, "invalid arguments")
+            return
+
+        print(f"[Grok] Function call complete: {call.name} with args: {args}")
+
+        # For check_canvas, we need to cancel the response immediately
+        # to prevent Grok from speaking "I don't see your answer" while we analyze
+        if call.name == "check_canvas":
+            print("[Grok] Cancelling response to wait for vision analysis...")
+            await self.cancel_response()
+
+        await self._emit(
+            GrokClientEvent.FUNCTION_CALL.value,
+            {"call_id": call.call_id, "name": call.name, "arguments": args},
+        )
+
+    async def _on_response_done(self, message: dict) -> None:
+        # Calls that never finished belong to a response that is over
+        if self._function_calls:
+            names = ", ".join(call.name for call in self._function_calls.values())
+            print(f"[Grok] Discarding unfinished function call(s): {names}")
+            calls = list(self._function_calls.values())
+            self._function_calls.clear()
+            for call in calls:
+                await self._discard_function_call(call, "response ended")
+
+    async def _discard_function_call(self, call: PendingFunctionCall, reason: str) -> None:
+        """Tell listeners a started call will never get a FUNCTION_CALL event."""
+        await self._emit(
+            GrokClientEvent.FUNCTION_CALL_DISCARDED.value,
+            {"call_id": call.call_id, "name": call.name, "reason": reason},
+        )
+
+    async def _on_error_message(self, message: dict) -> None:
+        error = message.get("error", {})
+        error_code = error.get("code", "unknown")
+        error_message = error.get("message", "Unknown error")
+        print(f"[Grok Error] {error_code}: {error_message}")
+        # An error before session.updated means the handshake failed
+        if not self._session_configured:
+            self._fail_ready(f"{error_code}: {error_message}")
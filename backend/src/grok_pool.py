@@ -0,0 +1,178 @@
+"""Pool of pre-warmed, already-configured Grok realtime connections."""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import replace
+
+from .grok_client import GrokConfig, GrokVoiceClient
+
+
+def _config_key(config: GrokConfig) -> tuple:
+    """Fields that must match for a pooled session to be usable by a student."""
+    return (
+        config.voice,
+        config.instructions,
+        config.input_sample_rate,
+        config.output_sample_rate,
+        config.turn_detection,
+    )
+
+
+class GrokConnectionPool:
+    """Keeps N Grok sessions connected and configured ahead of time.
+
+    A fresh session costs a connect, conversation.created, session.update and
+    session.updated round trip before the greeting can go out. Pooled sessions
+    have done all of that already, so a student only waits for the greeting.
+    Idle sessions are evicted after `max_idle_seconds` and the pool refills itself
+    in the background.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        config_factory: Callable[[], GrokConfig],
+        size: int = 2,
+        max_idle_seconds: float = 240.0,
+        ready_timeout: float = 15.0,
+        refill_interval: float = 5.0,
+    ):
+        self.api_key = api_key
+        self.config_factory = config_factory
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self.ready_timeout = ready_timeout
+        self.refill_interval = refill_interval
+
+        self._idle: deque[tuple[float, GrokVoiceClient]] = deque()
+        self._warming = 0
+        self._warm_tasks: set[asyncio.Task] = set()
+        self._refill_task: asyncio.Task | None = None
+        self._closed = False
+        self._wake = asyncio.Event()
+
+        # Counters exposed via /metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.warm_failures = 0
+
+    async def start(self) -> None:
+        """Start warming connections in the background."""
+        if self._refill_task is None:
+            print(f"[Pool] Starting Grok connection pool (size {self.size})")
+            self._refill_task = asyncio.create_task(self._refill_loop())
+
+    async def close(self) -> None:
+        """Stop refilling, cancel sessions still warming and disconnect all idle sessions."""
+        self._closed = True
+        if self._refill_task:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+
+        warm_tasks = list(self._warm_tasks)
+        for task in warm_tasks:
+            task.cancel()
+        await asyncio.gather(*warm_tasks, return_exceptions=True)
+
+        while self._idle:
+            _, client = self._idle.popleft()
+            await client.disconnect()
+
+    def acquire(self, config: GrokConfig) -> GrokVoiceClient | None:
+        """Hand out a ready session matching `config`, or None if none is available.
+
+        The returned session has not greeted yet; the caller attaches its callbacks
+        and then calls `send_initial_greeting()`.
+        """
+        key = _config_key(config)
+        now = time.monotonic()
+        client = None
+
+        for _ in range(len(self._idle)):
+            created_at, candidate = self._idle.popleft()
+            if not candidate.is_ready or now - created_at > self.max_idle_seconds:
+                self.evictions += 1
+                asyncio.create_task(candidate.disconnect())
+            elif client is None and _config_key(candidate.config) == key:
+                client = candidate
+            else:
+                self._idle.append((created_at, candidate))
+
+        if client:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._wake.set()
+        return client
+
+    def stats(self) -> dict:
+        """Pool occupancy and hit/miss counters."""
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "warming": self._warming,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "warm_failures": self.warm_failures,
+        }
+
+    async def _refill_loop(self) -> None:
+        """Evict stale sessions and top the pool back up to `size`."""
+        while True:
+            self._evict_stale()
+            missing = self.size - len(self._idle) - self._warming
+            for _ in range(max(0, missing)):
+                self._warming += 1
+                task = asyncio.create_task(self._warm_one())
+                self._warm_tasks.add(task)
+                task.add_done_callback(self._warm_tasks.discard)
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.refill_interval)
+            except TimeoutError:
+                pass
+
+    def _evict_stale(self) -> None:
+        now = time.monotonic()
+        fresh: deque[tuple[float, GrokVoiceClient]] = deque()
+        for created_at, client in self._idle:
+            if client.is_ready and now - created_at <= self.max_idle_seconds:
+                fresh.append((created_at, client))
+            else:
+                self.evictions += 1
+                asyncio.create_task(client.disconnect())
+        self._idle = fresh
+
+    async def _warm_one(self) -> None:
+        """Open and configure one session without greeting."""
+        config = replace(self.config_factory(), send_greeting=False)
+        client = GrokVoiceClient(api_key=self.api_key, config=config)
+        try:
+            await client.connect()
+            await client.wait_until_ready(timeout=self.ready_timeout)
+            if self._closed:
+                await client.disconnect()
+                return
+            self._idle.append((time.monotonic(), client))
+            print(f"[Pool] Warm session ready ({len(self._idle)}/{self.size} idle)")
+        except asyncio.CancelledError:
+            await client.disconnect()
+            raise
+        except Exception as e:
+            self.warm_failures += 1
+            print(f"[Pool] Failed to warm session: {type(e).__name__}: {e}")
+            await client.disconnect()
+            # Back off before the next attempt instead of hammering the API
+            await asyncio.sleep(self.refill_interval)
+        finally:
+            self._warming -= 1
+            self._wake.set()
@@ -1,9 +1,21 @@
 """Grok Vision API client for analyzing canvas screenshots."""
 
+import asyncio
+import contextlib
 import time
+from dataclasses import dataclass
 
 import httpx
 
+from .vision_cache import VisionCache, screenshot_hash
+
+try:
+    import h2  # type: ignore[import-not-found]  # noqa: F401
+except ImportError:  # h2 is an optional dependency (pip install .[http2])
+    H2_AVAILABLE = False
+else:
+    H2_AVAILABLE = True
+
 XAI_CHAT_URL = "https://api.x.ai/v1/chat/completions"
 VISION_MODEL = "grok-4"  # Latest model with vision capabilities
 
@@ -21,10 +33,83 @@ Response format:
 
 Bounding box: Use pixel coords (canvas ~800x600). x=0 left, y=0 top. Be generous with size."""
 
+# Process-wide client, so check_canvas reuses warm connections instead of paying
+# DNS + TCP + TLS before every upload. Created by start_vision_client().
+_client: httpx.AsyncClient | None = None
+_read_timeout = 90.0
+_pool_timeout = 90.0
+_max_connections = 20
+
+
+def start_vision_client(
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 60.0,
+    connect_timeout: float = 5.0,
+    read_timeout: float = 90.0,
+    pool_timeout: float | None = None,
+    http2: bool = False,
+) -> httpx.AsyncClient:
+    """Create the shared HTTP client used by analyze_canvas_screenshot.
+
+    `pool_timeout` is how long a request waits for one of the `max_connections`
+    connections when they are all busy (defaults to `read_timeout`). A busy
+    classroom should queue for a connection, not fail after the connect timeout.
+    """
+    global _client, _read_timeout, _pool_timeout, _max_connections
+    if _client is not None:
+        return _client
+
+    if http2 and not H2_AVAILABLE:
+        print("[Vision] HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+        http2 = False
+
+    # Uploads are large base64 images, so writes get the read budget too
+    _read_timeout = read_timeout
+    _pool_timeout = read_timeout if pool_timeout is None else pool_timeout
+    _max_connections = max_connections
+    _client = httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=read_timeout,
+            pool=_pool_timeout,
+        ),
+    )
+    return _client
+
+
+@dataclass
+class _Flight:
+    """A vision request in progress and the number of callers waiting on it."""
+
+    task: asyncio.Task
+    waiters: int = 0
+
+
+# Requests in progress by screenshot hash, shared by every session in the process.
+# Concurrent check_canvas calls for the same board wait on one request.
+_in_flight: dict[str, _Flight] = {}
+
+
+async def close_vision_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
 
 async def analyze_canvas_screenshot(
     api_key: str,
     screenshot_b64: str,
+    cache: VisionCache | None = None,
 ) -> str | None:
     """
     Analyze a canvas screenshot using Grok Vision API.
@@ -32,6 +117,9 @@ async def analyze_canvas_screenshot(
     Args:
         api_key: xAI API key
         screenshot_b64: Base64-encoded image (data URL format: data:image/...;base64,...)
+        cache: Results for identical screenshots are served from here, and new ones stored
+
+    Concurrent calls for the same screenshot share one request and all get its result.
 
     Returns:
         Description of what's on the canvas, or None if analysis fails
@@ -45,6 +133,51 @@ async def analyze_canvas_screenshot(
     size_kb = size_bytes / 1024
     print(f"[Vision] Screenshot size: {size_kb:.1f} KB ({size_bytes} bytes)")
 
+    key = screenshot_hash(screenshot_b64)
+    if key and cache is not None:
+        cached = cache.get(key, size_bytes)
+        if cached:
+            print(f"[Vision] Cache hit for {key[:12]}: {cached[:150]}...")
+            return cached
+    if not key:
+        return await _request_analysis(api_key, screenshot_b64)
+
+    flight = _in_flight.get(key)
+    if flight is None:
+        flight = _Flight(asyncio.create_task(_analyze_and_cache(api_key, screenshot_b64, key, cache)))
+        _in_flight[key] = flight
+        flight.task.add_done_callback(lambda task: _end_flight(key, task))
+    else:
+        print(f"[Vision] Joining in-flight analysis for {key[:12]}")
+
+    flight.waiters += 1
+    try:
+        # Shielded so one caller going away doesn't cancel the request for the others
+        return await asyncio.shield(flight.task)
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            print(f"[Vision] No callers left for {key[:12]}, cancelling analysis")
+            flight.task.cancel()
+
+
+async def _analyze_and_cache(
+    api_key: str, screenshot_b64: str, key: str, cache: VisionCache | None
+) -> str | None:
+    result = await _request_analysis(api_key, screenshot_b64)
+    if result and cache is not None:
+        cache.put(key, result)
+    return result
+
+
+def _end_flight(key: str, task: asyncio.Task) -> None:
+    flight = _in_flight.get(key)
+    if flight is not None and flight.task is task:
+        del _in_flight[key]
+
+
+async def _request_analysis(api_key: str, screenshot_b64: str) -> str | None:
+    """Send one screenshot to the vision model and return its description."""
     # Handle both data URL format and raw base64
     if screenshot_b64.startswith("data:"):
         image_url = screenshot_b64
@@ -60,8 +193,9 @@ async def analyze_canvas_screenshot(
 
     start_time = time.time()
     try:
-        # 90s timeout - vision API can be slow, we want to wait for it during demo
-        async with httpx.AsyncClient(timeout=90.0) as client:
+        # Outside the app (scripts, REPL) there is no shared client; use a one-off one
+        shared = contextlib.nullcontext(_client) if _client else None
+        async with shared or httpx.AsyncClient(timeout=_read_timeout) as client:
             print(f"[Vision] Sending request to {VISION_MODEL}...")
             response = await client.post(
                 XAI_CHAT_URL,
@@ -120,9 +254,16 @@ async def analyze_canvas_screenshot(
             print("[Vision] Empty response from API")
             return None
 
+    except httpx.PoolTimeout:
+        elapsed = time.time() - start_time
+        print(
+            f"[Vision] All {_max_connections} connections busy for {elapsed:.2f}s "
+            f"(pool limit: {_pool_timeout:g}s), giving up"
+        )
+        return None
     except httpx.TimeoutException:
         elapsed = time.time() - start_time
-        print(f"[Vision] Request timed out after {elapsed:.2f}s (limit: 90s)")
+        print(f"[Vision] Request timed out after {elapsed:.2f}s (read limit: {_read_timeout:g}s)")
         return None
     except httpx.ConnectError as e:
         elapsed = time.time() - start_time
@@ -0,0 +1,96 @@
+"""Incremental extraction of array elements from a JSON object that is still streaming in."""
+
+from . import codec
+
+
+class JsonArrayStreamer:
+    """Emits each element of one top-level array as soon as the element closes.
+
+    Grok streams function-call arguments as JSON text deltas. For a call like
+    draw_on_canvas({"items": [{...}, {...}]}) this yields every completed item
+    while the rest of the arguments are still being generated. Only object and
+    array elements are emitted (scalars are skipped). Elements come out in
+    document order, so for an array of objects the first N emitted are the
+    first N elements of the final parsed array.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_at_top = False  # Current string belongs to the top-level object
+        self._string_chars: list[str] = []
+        self._last_string: str | None = None
+        self._current_key: str | None = None
+        self._array_depth: int | None = None  # Nesting depth inside the target array
+        self._element: list[str] | None = None  # Characters of the element being read
+        self._finished = False  # Array closed, or the input turned out to be malformed
+        self.emitted = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, chunk: str) -> list:
+        """Consume more JSON text and return the elements completed by it."""
+        completed: list = []
+        if self._finished:
+            return completed
+
+        for c in chunk:
+            if self._element is not None:
+                self._element.append(c)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._string_at_top:
+                        self._last_string = "".join(self._string_chars)
+                    continue
+                if self._string_at_top:
+                    self._string_chars.append(c)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_at_top = self._depth == 1 and self._array_depth is None
+                self._string_chars.clear()
+            elif c in "{[":
+                if self._depth == self._array_depth and self._element is None:
+                    self._element = [c]
+                elif (
+                    c == "["
+                    and self._depth == 1
+                    and self._array_depth is None
+                    and self._current_key == self.key
+                ):
+                    self._array_depth = 2
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._array_depth is None:
+                    continue
+                if self._element is not None and self._depth == self._array_depth:
+                    text = "".join(self._element)
+                    self._element = None
+                    try:
+                        completed.append(codec.loads(text))
+                    except codec.DecodeError:
+                        self._finished = True
+                        break
+                elif self._depth < self._array_depth:
+                    self._finished = True
+                    break
+            elif self._depth == 1:
+                if c == ":":
+                    self._current_key = self._last_string
+                elif c == ",":
+                    self._current_key = None
+
+        self.emitted += len(completed)
+        return completed
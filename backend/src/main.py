@@ -7,21 +7,44 @@ and xAI's Grok Voice API, adding canvas context for the math tutoring experience
 
 import asyncio
 import base64
-import json
 import os
 import time
+from collections.abc import Awaitable
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
 
+from . import codec
+from .audio_queue import OverflowPolicy, TutorAudioQueue
+from .audio_resampler import NUMPY_AVAILABLE, StreamingResampler
 from .canvas_processor import describe_changes, summarize_canvas
-from .grok_client import GrokConfig, GrokVoiceClient
-from .grok_vision import analyze_canvas_screenshot
+from .grok_client import (
+    GROK_NATIVE_SAMPLE_RATE,
+    XAI_REALTIME_URL,
+    GrokClientEvent,
+    GrokConfig,
+    GrokMessageType,
+    GrokVoiceClient,
+    build_session_update,
+    tools_fingerprint,
+)
+from .grok_pool import GrokConnectionPool
+from .grok_vision import (
+    H2_AVAILABLE,
+    analyze_canvas_screenshot,
+    close_vision_client,
+    start_vision_client,
+)
+from .incremental_json import JsonArrayStreamer
+from .screenshot_preprocess import PILLOW_AVAILABLE, PreparedScreenshot, prepare_screenshot
 from .session import Session, SessionManager
 from .types import (
+    AudioMode,
     CanvasChangeMessage,
     CanvasCommandMessage,
     CanvasUpdateMessage,
@@ -30,11 +53,14 @@ from .types import (
     TextMessageClient,
     TldrawShapeData,
     TutorStatusMessage,
+    UpstreamStatusMessage,
     VoiceAudioClientMessage,
-    VoiceAudioServerMessage,
     VoiceStateMessage,
+    VoiceTranscriptDeltaMessage,
     VoiceTranscriptMessage,
 )
+from .vision_cache import VisionCache
+from .voice_activity import VoiceActivityGate
 
 # Load environment variables
 load_dotenv()
@@ -44,6 +70,89 @@ XAI_API_KEY = os.getenv("XAI_API_KEY", "")
 PORT = int(os.getenv("PORT", "8080"))
 VOICE = os.getenv("VOICE", "tara")
 
+# Audio transport negotiated per connection via the ?audio= query param:
+# "json" uses base64 VOICE_AUDIO messages, "binary" uses raw PCM16 binary frames
+# in both directions (mic audio up, tutor audio down)
+AUDIO_MODES: tuple[AudioMode, ...] = ("json", "binary")
+
+# Resample client audio to Grok's native 24kHz (and tutor audio back) on the server.
+# Requires numpy; browsers usually capture at 48kHz, which doubles upstream traffic.
+RESAMPLE_AUDIO = os.getenv("RESAMPLE_AUDIO", "false").lower() == "true"
+
+# Outbound tutor audio queue per session: block, drop_oldest, or disconnect
+AUDIO_QUEUE_POLICY = OverflowPolicy(os.getenv("AUDIO_QUEUE_POLICY", "drop_oldest"))
+AUDIO_QUEUE_MAX_CHUNKS = int(os.getenv("AUDIO_QUEUE_MAX_CHUNKS", "1000"))
+AUDIO_QUEUE_MAX_LAG_SECONDS = float(os.getenv("AUDIO_QUEUE_MAX_LAG_SECONDS", "10"))
+
+# Uplink batching of small mic chunks into larger input_audio_buffer.append messages.
+# Batches flush at AUDIO_UPLINK_BATCH_MS of audio or after the deadline; 0 disables.
+AUDIO_UPLINK_BATCH_MS = int(os.getenv("AUDIO_UPLINK_BATCH_MS", "0"))
+AUDIO_UPLINK_BATCH_MAX_BYTES = int(os.getenv("AUDIO_UPLINK_BATCH_MAX_BYTES", "0"))
+AUDIO_UPLINK_BATCH_DEADLINE_MS = int(os.getenv("AUDIO_UPLINK_BATCH_DEADLINE_MS", "40"))
+
+# Local VAD prefilter that stops forwarding silent mic audio upstream (requires numpy)
+VAD_PREFILTER = os.getenv("VAD_PREFILTER", "false").lower() == "true"
+VAD_ENERGY_THRESHOLD_DB = float(os.getenv("VAD_ENERGY_THRESHOLD_DB", "-45"))
+VAD_PRE_ROLL_MS = int(os.getenv("VAD_PRE_ROLL_MS", "300"))
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "800"))
+
+# Stream tutor captions as Grok produces them (VOICE_TRANSCRIPT_DELTA), batching deltas
+# so at most one message per TRANSCRIPT_STREAM_INTERVAL_MS goes to the browser
+TRANSCRIPT_STREAMING = os.getenv("TRANSCRIPT_STREAMING", "false").lower() == "true"
+TRANSCRIPT_STREAM_INTERVAL_MS = int(os.getenv("TRANSCRIPT_STREAM_INTERVAL_MS", "100"))
+
+# Draw draw_on_canvas items as soon as each one is complete in the streamed tool arguments,
+# instead of after the whole call has been generated
+DRAW_STREAMING = os.getenv("DRAW_STREAMING", "true").lower() == "true"
+
+# Function queue entry for one draw_on_canvas item parsed ahead of the full call
+STREAMED_DRAW_ITEM = "_draw_on_canvas_item"
+
+# Tools that change the canvas run one at a time in call order; the others run as soon
+# as they arrive, so a slow check_canvas doesn't hold up point_to or celebrate
+SEQUENTIAL_TOOLS = frozenset({"draw_on_canvas", "draw_shape", "clear_canvas", "circle_answer"})
+
+# Pre-warmed Grok sessions handed out on /ws accept (0 disables the pool).
+# Sessions are warmed at 24kHz when resampling is on, otherwise at the common 48kHz.
+GROK_POOL_SIZE = int(os.getenv("GROK_POOL_SIZE", "0"))
+GROK_POOL_MAX_IDLE_SECONDS = float(os.getenv("GROK_POOL_MAX_IDLE_SECONDS", "240"))
+
+# How long a new session may take to be configured before the client gets an error
+GROK_READY_TIMEOUT_SECONDS = float(os.getenv("GROK_READY_TIMEOUT_SECONDS", "15"))
+
+# Resume dropped Grok sessions in the background (0 attempts disables it). The new
+# session gets a recap of the last GROK_REPLAY_MAX_MESSAGES turns and the canvas state.
+GROK_RECONNECT_ATTEMPTS = int(os.getenv("GROK_RECONNECT_ATTEMPTS", "5"))
+GROK_RECONNECT_MAX_DELAY_SECONDS = float(os.getenv("GROK_RECONNECT_MAX_DELAY_SECONDS", "8"))
+GROK_REPLAY_MAX_MESSAGES = int(os.getenv("GROK_REPLAY_MAX_MESSAGES", "20"))
+
+# Shared HTTP client for check_canvas vision requests (connections stay warm between calls).
+# HTTP/2 needs the optional h2 package (pip install .[http2]).
+VISION_MAX_CONNECTIONS = int(os.getenv("VISION_MAX_CONNECTIONS", "20"))
+VISION_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("VISION_MAX_KEEPALIVE_CONNECTIONS", "10"))
+VISION_KEEPALIVE_SECONDS = float(os.getenv("VISION_KEEPALIVE_SECONDS", "60"))
+VISION_CONNECT_TIMEOUT_SECONDS = float(os.getenv("VISION_CONNECT_TIMEOUT_SECONDS", "5"))
+VISION_READ_TIMEOUT_SECONDS = float(os.getenv("VISION_READ_TIMEOUT_SECONDS", "90"))
+# How long a request waits for a free connection when all are busy (default: the read timeout)
+VISION_POOL_TIMEOUT_SECONDS = float(
+    os.getenv("VISION_POOL_TIMEOUT_SECONDS") or VISION_READ_TIMEOUT_SECONDS
+)
+VISION_HTTP2 = os.getenv("VISION_HTTP2", "false").lower() == "true"
+
+# Vision results shared across sessions, keyed by screenshot content (0 entries disables)
+VISION_CACHE_MAX_ENTRIES = int(os.getenv("VISION_CACHE_MAX_ENTRIES", "256"))
+VISION_CACHE_TTL_SECONDS = float(os.getenv("VISION_CACHE_TTL_SECONDS", "300"))
+
+# Speculative vision: start analyzing the VOICE_START screenshot while the student is still
+# talking, if it has handwriting the tutor hasn't seen. check_canvas then reuses that work.
+VISION_PREFETCH = os.getenv("VISION_PREFETCH", "false").lower() == "true"
+
+# Crop screenshots to the student's work, downscale and recompress them before vision.
+# Requires Pillow (pip install .[vision]).
+SCREENSHOT_PREPROCESS = os.getenv("SCREENSHOT_PREPROCESS", "false").lower() == "true"
+SCREENSHOT_MAX_SIDE = int(os.getenv("SCREENSHOT_MAX_SIDE", "1024"))
+SCREENSHOT_JPEG_QUALITY = int(os.getenv("SCREENSHOT_JPEG_QUALITY", "80"))
+
 # Tool definitions for canvas drawing and control
 CANVAS_TOOLS = [
     {
@@ -280,9 +389,41 @@ ALLOWED_ORIGINS = os.getenv(
 ).split(",")
 
 
+# Computed once; lets every session reuse the same serialized session.update
+CANVAS_TOOLS_VERSION = tools_fingerprint(CANVAS_TOOLS)
+
+
+def build_grok_config(sample_rate: int, instructions: str = MATH_TUTOR_INSTRUCTIONS) -> GrokConfig:
+    """Grok session configuration shared by live and pre-warmed connections."""
+    return GrokConfig(
+        voice=VOICE,
+        instructions=instructions,
+        input_sample_rate=sample_rate,
+        output_sample_rate=sample_rate,
+        tools=CANVAS_TOOLS,
+        tools_version=CANVAS_TOOLS_VERSION,
+        input_batch_ms=AUDIO_UPLINK_BATCH_MS,
+        input_batch_max_bytes=AUDIO_UPLINK_BATCH_MAX_BYTES,
+        input_batch_deadline_ms=AUDIO_UPLINK_BATCH_DEADLINE_MS,
+        reconnect_attempts=GROK_RECONNECT_ATTEMPTS,
+        reconnect_max_delay=GROK_RECONNECT_MAX_DELAY_SECONDS,
+        reconnect_ready_timeout=GROK_READY_TIMEOUT_SECONDS,
+    )
+
+
 # Session manager (global)
 session_manager = SessionManager()
 
+vision_cache = VisionCache(
+    max_entries=VISION_CACHE_MAX_ENTRIES, ttl_seconds=VISION_CACHE_TTL_SECONDS
+)
+
+# Pre-warmed Grok connections (created in lifespan when GROK_POOL_SIZE > 0)
+grok_pool: GrokConnectionPool | None = None
+
+# Live connections by session ID, for per-session diagnostics
+active_connections: dict[str, "TutorConnection"] = {}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -293,17 +434,68 @@ async def lifespan(app: FastAPI):
     print("=" * 60)
     print(f"Port: {PORT}")
     print(f"API Key: {'Configured' if XAI_API_KEY else 'MISSING'}")
+    print(f"Grok realtime URL: {XAI_REALTIME_URL}")
     print(f"Voice: {VOICE}")
     print(f"CORS Origins: {', '.join(ALLOWED_ORIGINS)}")
+    print(f"Resample audio: {RESAMPLE_AUDIO and NUMPY_AVAILABLE}")
+    print(f"Audio queue: {AUDIO_QUEUE_POLICY.value} (max {AUDIO_QUEUE_MAX_CHUNKS} chunks)")
+    print(f"VAD prefilter: {VAD_PREFILTER and NUMPY_AVAILABLE}")
+    print(f"JSON codec: {codec.BACKEND}")
+    print(f"Transcript streaming: {TRANSCRIPT_STREAMING} ({TRANSCRIPT_STREAM_INTERVAL_MS}ms)")
     print("=" * 60)
 
+    if RESAMPLE_AUDIO and not NUMPY_AVAILABLE:
+        print("WARNING: RESAMPLE_AUDIO is enabled but numpy is not installed!")
+    if VAD_PREFILTER and not NUMPY_AVAILABLE:
+        print("WARNING: VAD_PREFILTER is enabled but numpy is not installed!")
+    if SCREENSHOT_PREPROCESS and not PILLOW_AVAILABLE:
+        print("WARNING: SCREENSHOT_PREPROCESS is enabled but Pillow is not installed!")
+
     if not XAI_API_KEY:
         print("WARNING: XAI_API_KEY not configured!")
 
+    # Serialize the session.update for the usual client rate up front
+    session_sample_rate = GROK_NATIVE_SAMPLE_RATE if RESAMPLE_AUDIO and NUMPY_AVAILABLE else 48000
+    session_update = build_session_update(build_grok_config(session_sample_rate))
+    print(f"Session config cached: {len(session_update) / 1024:.1f} KB at {session_sample_rate}Hz")
+
+    start_vision_client(
+        max_connections=VISION_MAX_CONNECTIONS,
+        max_keepalive_connections=VISION_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=VISION_KEEPALIVE_SECONDS,
+        connect_timeout=VISION_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=VISION_READ_TIMEOUT_SECONDS,
+        pool_timeout=VISION_POOL_TIMEOUT_SECONDS,
+        http2=VISION_HTTP2,
+    )
+    print(
+        f"Vision client: {'HTTP/2' if VISION_HTTP2 and H2_AVAILABLE else 'HTTP/1.1'}, "
+        f"{VISION_MAX_CONNECTIONS} connections, "
+        f"timeouts {VISION_CONNECT_TIMEOUT_SECONDS:g}s connect "
+        f"/ {VISION_READ_TIMEOUT_SECONDS:g}s read"
+    )
+    print(f"Vision cache: {VISION_CACHE_MAX_ENTRIES} entries, {VISION_CACHE_TTL_SECONDS:g}s TTL")
+    print(f"Vision prefetch: {VISION_PREFETCH}")
+    print(f"Screenshot preprocessing: {SCREENSHOT_PREPROCESS and PILLOW_AVAILABLE}")
+
+    global grok_pool
+    if GROK_POOL_SIZE > 0 and XAI_API_KEY:
+        grok_pool = GrokConnectionPool(
+            api_key=XAI_API_KEY,
+            config_factory=lambda: build_grok_config(session_sample_rate),
+            size=GROK_POOL_SIZE,
+            max_idle_seconds=GROK_POOL_MAX_IDLE_SECONDS,
+        )
+        await grok_pool.start()
+
     yield
 
     # Shutdown
     print("\nShutting down Voice AI Math Tutor backend")
+    if grok_pool:
+        await grok_pool.close()
+        grok_pool = None
+    await close_vision_client()
 
 
 # FastAPI app
@@ -333,6 +525,7 @@ async def root():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "websocket": "/ws",
         },
     }
@@ -348,16 +541,75 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Per-session diagnostics for live connections."""
+    return {
+        "active_sessions": len(active_connections),
+        "grok_pool": grok_pool.stats() if grok_pool else None,
+        "vision_cache": vision_cache.stats(),
+        "sessions": {
+            session_id: connection.get_stats()
+            for session_id, connection in active_connections.items()
+        },
+    }
+
+
+@dataclass
+class DrawProgress:
+    """Layout state of one draw_on_canvas call, shared by its streamed items and its result."""
+
+    parser: JsonArrayStreamer = field(default_factory=lambda: JsonArrayStreamer("items"))
+    drawn: int = 0  # Items already sent to the canvas
+    drawn_text: list[str] = field(default_factory=list)  # Text of the items sent so far
+    base_y: float | None = None  # Default y for items without one, fixed for the whole call
+    max_y_used: float = 0.0
+
+
 class TutorConnection:
     """Manages a single tutoring session WebSocket connection."""
 
-    def __init__(self, websocket: WebSocket, session: Session, sample_rate: int = 48000):
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session: Session,
+        sample_rate: int = 48000,
+        audio_mode: AudioMode = "json",
+    ):
         self.websocket = websocket
         self.session = session
         self.sample_rate = sample_rate
+        self.audio_mode = audio_mode  # "json" (base64 messages) or "binary" (raw PCM16 frames)
         self.grok_client: GrokVoiceClient | None = None
-        self._audio_queue: asyncio.Queue[bytes] = asyncio.Queue()
+        # Tutor audio waiting to be sent: base64 strings in json mode, PCM16 bytes in binary mode.
+        # Bounded so a slow browser socket cannot grow memory while Grok keeps streaming.
+        self._audio_queue = TutorAudioQueue(
+            maxsize=AUDIO_QUEUE_MAX_CHUNKS,
+            policy=AUDIO_QUEUE_POLICY,
+            max_lag_seconds=AUDIO_QUEUE_MAX_LAG_SECONDS,
+            on_overflow=self._on_audio_backlog,
+        )
         self._audio_sender_task: asyncio.Task | None = None
+        # Barge-in tracking: whether Grok is mid-response and how much of its audio went out.
+        # Grok streams faster than real time and the browser queues what it gets, so what
+        # the student actually heard is estimated from when the audio started playing.
+        self._response_active: bool = False
+        self._audio_ms_sent: float = 0.0
+        self._audio_started_at: float | None = None  # Monotonic time the response began playing
+        self._playback_ends_at: float = 0.0  # Monotonic time the browser runs out of audio
+        # Optional resampling between the client rate and Grok's native rate
+        self._uplink_resampler: StreamingResampler | None = None
+        self._downlink_resampler: StreamingResampler | None = None
+        # Session startup metrics
+        self._grok_ready_wait_ms: float | None = None
+        self._used_pooled_session: bool = False
+        # Optional local VAD that gates which mic audio is forwarded upstream
+        self._vad_gate: VoiceActivityGate | None = None
+        # Streaming captions: deltas not yet sent for the current tutor item
+        self._caption_item_id: str | None = None
+        self._caption_pending: list[str] = []
+        self._caption_last_sent: float = 0.0
+        self._caption_flush_task: asyncio.Task | None = None
         # Track where AI has drawn to avoid overlap
         self._next_y_position: float = 100.0  # Starting Y position for AI drawings
         self._last_x_position: float = 100.0  # Track column position
@@ -372,73 +624,200 @@ class TutorConnection:
         self._last_check_canvas_time: float = 0.0
         self._last_check_canvas_result: str | None = None
         self._check_canvas_cooldown: float = 10.0  # Seconds before allowing another check
-        self._vision_in_progress: bool = False  # Lock to prevent concurrent vision calls
+
+        # Speculative vision analysis started at VOICE_START (VISION_PREFETCH)
+        self._vision_prefetch: asyncio.Task | None = None
+        self._vision_prefetch_screenshot: str | None = None  # Screenshot being analyzed
+        self._analyzed_draw_ids: set[str] = set()  # Freehand shapes in the last finished analysis
+        self._prefetch_stats = {"started": 0, "used": 0, "cancelled": 0}
+
+        # Preprocessed copy of the latest screenshot (SCREENSHOT_PREPROCESS), made once and
+        # shared by prefetch and check_canvas. _vision_image and _vision_bounds describe what
+        # check_canvas last sent, so circle_answer can map the model's coordinates back to the
+        # canvas even after newer screenshots arrive.
+        self._prepared_for: str | None = None
+        self._prepared_task: asyncio.Task[PreparedScreenshot | None] | None = None
+        self._vision_image: PreparedScreenshot | None = None
+        self._vision_bounds: ScreenshotBounds | None = None
 
         # Screenshot tracking for diagnostics
         self._screenshot_timestamp: float = 0.0
         self._screenshot_source: str = "none"  # "voice_start" or "canvas_update"
         self._screenshot_bounds: ScreenshotBounds | None = None  # Bounds for coordinate transformation
+        # Shapes sent in the same message as the latest screenshot, None if there were none
+        self._screenshot_shapes: list[TldrawShapeData] | None = None
 
-        # Function call queue to ensure sequential execution
+        # Function call queue to ensure sequential execution of canvas-mutating tools
         self._function_queue: asyncio.Queue = asyncio.Queue()
         self._function_processor_task: asyncio.Task | None = None
+        self._tool_handlers = {
+            "draw_on_canvas": self._handle_draw_on_canvas,
+            "draw_shape": self._handle_draw_shape,
+            "point_to": self._handle_point_to,
+            "clear_canvas": self._handle_clear_canvas,
+            "celebrate": self._handle_celebrate,
+            "check_canvas": self._handle_check_canvas,
+            "circle_answer": self._handle_circle_answer,
+        }
+        self._tool_tasks: set[asyncio.Task] = set()  # Independent tools in flight
+        # Bumped when the Grok session drops. Results of calls made by an older
+        # session are discarded: the resumed conversation has never seen their call_id.
+        self._grok_generation = 0
+        self._call_generations: dict[str, int] = {}  # call_id -> generation that made the call
+        self._tools_pending = 0  # Tool calls received but not finished
+        self._tool_results_unanswered = 0  # Results sent since the last response.create
+        self._tool_timings: dict[str, dict] = {}  # Per-tool call count and durations
+        # draw_on_canvas calls whose items are being drawn while the arguments stream in
+        self._draw_progress: dict[str, DrawProgress] = {}
 
     async def send_json(self, data: dict) -> None:
         """Send JSON message to the frontend."""
-        await self.websocket.send_json(data)
+        await self.websocket.send_text(codec.dumps_str(data))
+
+    async def send_model(self, msg: BaseModel) -> None:
+        """Send a pydantic message to the frontend, serialized by pydantic-core."""
+        await self.websocket.send_text(msg.model_dump_json())
 
     async def send_voice_state(self, state: str) -> None:
         """Send voice state update to frontend."""
         msg = VoiceStateMessage(state=state)  # type: ignore
-        await self.send_json(msg.model_dump())
+        await self.send_model(msg)
 
     async def send_tutor_status(self, status: str) -> None:
         """Send tutor status update to frontend."""
         msg = TutorStatusMessage(status=status)  # type: ignore
-        await self.send_json(msg.model_dump())
+        await self.send_model(msg)
 
-    async def send_transcript(self, role: str, text: str) -> None:
+    async def send_transcript(self, role: str, text: str, item_id: str | None = None) -> None:
         """Send transcript message to frontend."""
-        msg = VoiceTranscriptMessage(role=role, text=text)  # type: ignore
-        await self.send_json(msg.model_dump())
+        msg = VoiceTranscriptMessage(role=role, text=text, itemId=item_id)  # type: ignore
+        await self.send_model(msg)
         # Also save to session
         self.session.add_message(role, text)
 
-    async def send_audio(self, audio_bytes: bytes) -> None:
-        """Send audio to frontend (base64 encoded)."""
-        audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-        msg = VoiceAudioServerMessage(audio=audio_b64)
-        await self.send_json(msg.model_dump())
+    async def send_transcript_delta(self, item_id: str, delta: str) -> None:
+        """Send a partial tutor caption to frontend."""
+        msg = VoiceTranscriptDeltaMessage(itemId=item_id, delta=delta)
+        await self.send_model(msg)
+
+    async def send_audio(self, audio: str | bytes) -> None:
+        """Send audio to frontend.
+
+        Raw PCM16 bytes go out as a binary frame. Base64 strings are forwarded as-is
+        in a VOICE_AUDIO message, built directly instead of through the pydantic model
+        since this is the highest-frequency message we send.
+        """
+        if isinstance(audio, bytes):
+            await self.websocket.send_bytes(audio)
+        else:
+            await self.send_json({"type": "VOICE_AUDIO", "audio": audio})
+
+    def get_stats(self) -> dict:
+        """Per-session diagnostics."""
+        return {
+            "grok_ready_wait_ms": self._grok_ready_wait_ms,
+            "pooled_session": self._used_pooled_session,
+            "audio_queue": self._audio_queue.stats(),
+            "vad": self._vad_gate.stats() if self._vad_gate else None,
+            "vision_prefetch": dict(self._prefetch_stats) if VISION_PREFETCH else None,
+            "grok_frames": {
+                "sent": self.grok_client.frames_sent,
+                "coalesced": self.grok_client.frames_coalesced,
+            }
+            if self.grok_client
+            else None,
+            "tools": {
+                name: {
+                    "calls": timing["calls"],
+                    "avg_ms": round(timing["total_ms"] / timing["calls"], 1),
+                    "max_ms": round(timing["max_ms"], 1),
+                }
+                for name, timing in self._tool_timings.items()
+            },
+        }
 
     async def send_error(self, code: str, message: str) -> None:
         """Send error to frontend."""
         msg = ErrorMessage(code=code, message=message)
-        await self.send_json(msg.model_dump())
+        await self.send_model(msg)
 
     async def send_canvas_command(self, command) -> None:
         """Send canvas command to frontend."""
         msg = CanvasCommandMessage(command=command)
-        await self.send_json(msg.model_dump())
+        await self.send_model(msg)
 
     async def send_celebrate(self, intensity: str = "big") -> None:
         """Send celebrate message to frontend."""
         from .types import CelebrateMessage
         msg = CelebrateMessage(intensity=intensity)  # type: ignore
-        await self.send_json(msg.model_dump())
+        await self.send_model(msg)
 
     async def send_clear_check_context(self) -> None:
         """Send message to clear previous check context from transcript."""
         from .types import ClearCheckContextMessage
         msg = ClearCheckContextMessage()
-        await self.send_json(msg.model_dump())
+        await self.send_model(msg)
 
-    def _on_function_call(self, call_id: str, name: str, args: dict) -> None:
+    async def send_upstream_status(self, status: str, attempt: int | None = None) -> None:
+        """Send Grok connection status (reconnecting/connected/failed) to frontend."""
+        msg = UpstreamStatusMessage(status=status, attempt=attempt)  # type: ignore
+        await self.send_model(msg)
+
+    def _on_function_call(self, message: dict) -> None:
         """Handle function calls from Grok (tool use).
 
-        Function calls are queued and processed sequentially to ensure
+        Canvas-mutating calls are queued and processed sequentially to ensure
         proper ordering (e.g., clear_canvas happens before draw_on_canvas).
+        Everything else runs concurrently.
         """
-        # Queue the function call for sequential processing
+        call_id, name, args = message["call_id"], message["name"], message["arguments"]
+        self._call_generations[call_id] = self._grok_generation
+        self._tools_pending += 1
+        if name in SEQUENTIAL_TOOLS:
+            self._enqueue_function(call_id, name, args)
+        else:
+            task = asyncio.create_task(self._run_tool(call_id, name, args))
+            self._tool_tasks.add(task)
+            task.add_done_callback(self._tool_tasks.discard)
+
+    def _on_function_args_delta(self, message: dict) -> None:
+        """Queue draw_on_canvas items as soon as they are complete in the streamed arguments."""
+        if message["name"] != "draw_on_canvas":
+            return
+
+        call_id = message["call_id"]
+        progress = self._draw_progress.get(call_id)
+        if progress is None:
+            progress = self._draw_progress[call_id] = DrawProgress()
+        for item in progress.parser.feed(message["delta"]):
+            self._enqueue_function(call_id, STREAMED_DRAW_ITEM, item)
+
+    def _on_function_call_discarded(self, message: dict) -> Awaitable[None] | None:
+        """Clean up after a call that Grok started but never finished.
+
+        Streamed draw_on_canvas items are already on the board. They stay there,
+        and Grok is told about them, since it never gets a result for the call.
+        Items still queued for the call are skipped.
+        """
+        progress = self._draw_progress.pop(message["call_id"], None)
+        if not (progress and progress.drawn_text):
+            return None
+        print(
+            f"[Canvas] draw_on_canvas cut off ({message['reason']}) "
+            f"after {len(progress.drawn_text)} item(s)"
+        )
+        if progress.max_y_used > self._next_y_position:
+            self._next_y_position = progress.max_y_used
+        if not (self.grok_client and self.grok_client.is_connected):
+            return None
+        drawn = "; ".join(progress.drawn_text)
+        return self.grok_client.inject_context(
+            f"Your draw_on_canvas call was cut off. These items were already drawn and are "
+            f"still on the board: {drawn}. Next available y position: "
+            f"{int(self._next_y_position)}."
+        )
+
+    def _enqueue_function(self, call_id: str, name: str, args: dict) -> None:
         self._function_queue.put_nowait((call_id, name, args))
 
         # Start the processor if not already running
@@ -446,53 +825,127 @@ class TutorConnection:
             self._function_processor_task = asyncio.create_task(self._process_function_queue())
 
     async def _process_function_queue(self) -> None:
-        """Process function calls sequentially from the queue.
-
-        Only triggers response.create after the LAST function in the batch
-        to avoid multiple responses being generated.
-        """
+        """Process canvas-mutating function calls sequentially from the queue."""
         while not self._function_queue.empty():
             call_id, name, args = await self._function_queue.get()
-            is_last = self._function_queue.empty()
-            print(f"[Queue] Processing function: {name} (last={is_last})")
+            if name == STREAMED_DRAW_ITEM:
+                try:
+                    await self._handle_streamed_draw_item(call_id, args)
+                except Exception as e:
+                    # A bad item must not stop the queue: later calls still need to run
+                    print(f"[Tools] Error drawing streamed item for {call_id}: {e}")
+                continue
+            await self._run_tool(call_id, name, args)
 
-            try:
-                if name == "draw_on_canvas":
-                    await self._handle_draw_on_canvas(call_id, args, is_last)
-                elif name == "draw_shape":
-                    await self._handle_draw_shape(call_id, args, is_last)
-                elif name == "point_to":
-                    await self._handle_point_to(call_id, args, is_last)
-                elif name == "clear_canvas":
-                    await self._handle_clear_canvas(call_id, args, is_last)
-                elif name == "celebrate":
-                    await self._handle_celebrate(call_id, args, is_last)
-                elif name == "check_canvas":
-                    await self._handle_check_canvas(call_id, args, is_last)
-                elif name == "circle_answer":
-                    await self._handle_circle_answer(call_id, args, is_last)
-                else:
-                    print(f"[Grok] Unknown function call: {name}")
-            except Exception as e:
-                print(f"[Queue] Error processing {name}: {e}")
+    async def _run_tool(self, call_id: str, name: str, args: dict) -> None:
+        """Run one tool call and record how long it took.
 
-    async def _handle_draw_on_canvas(self, call_id: str, args: dict, is_last: bool = True) -> None:
-        """Handle the draw_on_canvas function call with animated handwriting."""
-        from .types import AddAnimatedTextCommand
+        Handlers send their result without requesting a response; Grok is asked
+        to respond once, after the last tool of the batch finishes.
+        """
+        print(f"[Tools] Processing function: {name} ({self._tools_pending} pending)")
+        generation = self._call_generations.get(call_id, self._grok_generation)
+        start = time.monotonic()
+        try:
+            handler = self._tool_handlers.get(name)
+            if handler:
+                await handler(call_id, args)
+            else:
+                print(f"[Grok] Unknown function call: {name}")
+                await self._send_function_result(call_id, f"Unknown function: {name}")
+        except Exception as e:
+            print(f"[Tools] Error processing {name}: {e}")
+        finally:
+            self._record_tool_time(name, time.monotonic() - start)
+            self._call_generations.pop(call_id, None)
+            # A reconnect resets the counts; a call from the old session no longer counts
+            if generation == self._grok_generation:
+                self._tools_pending -= 1
+                self._tool_results_unanswered += 1
+                self._maybe_request_tool_response()
+
+    async def _send_function_result(self, call_id: str, result: str) -> None:
+        """Send a tool result to Grok, unless the session that made the call has dropped."""
+        if self._call_generations.get(call_id) != self._grok_generation:
+            print(f"[Tools] Dropping result for {call_id} from before the Grok reconnect")
+            return
+        if self.grok_client and self.grok_client.is_connected:
+            await self.grok_client.send_function_result(call_id, result, request_response=False)
+
+    def _maybe_request_tool_response(self) -> None:
+        """Ask Grok to respond to a finished batch of tool results, exactly once.
 
+        Waits until no tool is still running and the response that made the calls
+        is done, so results arriving one by one don't each trigger a response.
+        """
+        if self._tools_pending or not self._tool_results_unanswered or self._response_active:
+            return
+        self._tool_results_unanswered = 0
+        if self.grok_client and self.grok_client.is_connected:
+            asyncio.create_task(self.grok_client.request_response())
+
+    def _record_tool_time(self, name: str, seconds: float) -> None:
+        timing = self._tool_timings.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        timing["calls"] += 1
+        timing["total_ms"] += seconds * 1000
+        timing["max_ms"] = max(timing["max_ms"], seconds * 1000)
+
+    async def _handle_draw_on_canvas(self, call_id: str, args: dict) -> None:
+        """Handle the draw_on_canvas function call with animated handwriting."""
         items = args.get("items", [])
-        print(f"[Canvas] Drawing {len(items)} items with animation")
+        progress = self._draw_progress.pop(call_id, None) or DrawProgress()
+        if progress.drawn:
+            print(
+                f"[Canvas] Drawing {len(items)} items with animation "
+                f"({progress.drawn} already streamed)"
+            )
+        else:
+            print(f"[Canvas] Drawing {len(items)} items with animation")
 
-        # Track the maximum Y position used in this draw call
-        max_y_used = self._next_y_position
+        await self._draw_items(progress, items[progress.drawn:])
+
+        # Update next Y position for future draws
+        self._next_y_position = progress.max_y_used
+        print(f"[Canvas] Next Y position updated to: {self._next_y_position}")
+
+        # Update tutor status
+        await self.send_tutor_status("drawing")
+
+        # Send function result back to Grok with position info
+        await self._send_function_result(
+            call_id,
+            f"Drew {len(items)} item(s) on canvas. "
+            f"Next available y position: {int(self._next_y_position)}.",
+        )
+
+    async def _handle_streamed_draw_item(self, call_id: str, item: dict) -> None:
+        """Draw one draw_on_canvas item while the rest of the call is still generating."""
+        progress = self._draw_progress.get(call_id)
+        if progress is None:
+            return
+        if progress.drawn == 0:
+            await self.send_tutor_status("drawing")
+        await self._draw_items(progress, [item])
+
+    async def _draw_items(self, progress: DrawProgress, items: list[dict]) -> None:
+        """Send draw_on_canvas items as animated handwriting, tracking layout in `progress`."""
+        from .types import AddAnimatedTextCommand
+
+        if progress.base_y is None:
+            # Track the maximum Y position used in this draw call
+            progress.base_y = progress.max_y_used = self._next_y_position
 
         for item in items:
+            progress.drawn += 1
+            if not isinstance(item, dict):
+                continue  # The streamer also yields nested arrays
             text = item.get("text", "")
             if not text:
                 continue
+            progress.drawn_text.append(text)
 
             x = item.get("x", self._last_x_position)
-            y = item.get("y", self._next_y_position)
+            y = item.get("y", progress.base_y)
             color = item.get("color", "white")
             size = item.get("size", "m")
 
@@ -500,8 +953,8 @@ class TutorConnection:
             line_height = {"s": 30, "m": 50, "l": 70}.get(size, 50)
 
             # Track positions
-            if float(y) >= max_y_used:
-                max_y_used = float(y) + line_height
+            if float(y) >= progress.max_y_used:
+                progress.max_y_used = float(y) + line_height
             self._last_x_position = float(x)
 
             # Use AddAnimatedTextCommand for handwriting animation
@@ -515,22 +968,7 @@ class TutorConnection:
             )
             await self.send_canvas_command(command)
 
-        # Update next Y position for future draws
-        self._next_y_position = max_y_used
-        print(f"[Canvas] Next Y position updated to: {self._next_y_position}")
-
-        # Update tutor status
-        await self.send_tutor_status("drawing")
-
-        # Send function result back to Grok with position info
-        if self.grok_client and self.grok_client.is_connected:
-            await self.grok_client.send_function_result(
-                call_id,
-                f"Drew {len(items)} item(s) on canvas. Next available y position: {int(self._next_y_position)}.",
-                request_response=is_last
-            )
-
-    async def _handle_draw_shape(self, call_id: str, args: dict, is_last: bool = True) -> None:
+    async def _handle_draw_shape(self, call_id: str, args: dict) -> None:
         """Handle the draw_shape function call."""
         from .canvas_command_parser import generate_shape_id
         from .types import AddShapeCommand, TldrawShapeData
@@ -598,14 +1036,13 @@ class TutorConnection:
         await self.send_tutor_status("drawing")
 
         # Send function result back to Grok with position info
-        if self.grok_client and self.grok_client.is_connected:
-            await self.grok_client.send_function_result(
-                call_id,
-                f"Drew {shape_type} at ({x:.0f}, {y:.0f}). Next available y position: {int(self._next_y_position)}.",
-                request_response=is_last
-            )
+        await self._send_function_result(
+            call_id,
+            f"Drew {shape_type} at ({x:.0f}, {y:.0f}). "
+            f"Next available y position: {int(self._next_y_position)}.",
+        )
 
-    async def _handle_point_to(self, call_id: str, args: dict, is_last: bool = True) -> None:
+    async def _handle_point_to(self, call_id: str, args: dict) -> None:
         """Handle the point_to function call - shows attention cursor."""
         from .types import AttentionToCommand
 
@@ -627,15 +1064,13 @@ class TutorConnection:
         asyncio.create_task(clear_after_delay())
 
         # Send function result back to Grok
-        if self.grok_client and self.grok_client.is_connected:
-            label_text = f" with label '{label}'" if label else ""
-            await self.grok_client.send_function_result(
-                call_id,
-                f"Pointing to ({x:.0f}, {y:.0f}){label_text}. Attention will clear in 3 seconds.",
-                request_response=is_last
-            )
+        label_text = f" with label '{label}'" if label else ""
+        await self._send_function_result(
+            call_id,
+            f"Pointing to ({x:.0f}, {y:.0f}){label_text}. Attention will clear in 3 seconds.",
+        )
 
-    async def _handle_clear_canvas(self, call_id: str, args: dict, is_last: bool = True) -> None:
+    async def _handle_clear_canvas(self, call_id: str, args: dict) -> None:
         """Handle the clear_canvas function call."""
         from .types import ClearCanvasCommand
 
@@ -654,36 +1089,30 @@ class TutorConnection:
         await self.send_tutor_status("drawing")
 
         # Send function result back to Grok so it knows the action completed
-        if self.grok_client and self.grok_client.is_connected:
-            await self.grok_client.send_function_result(
-                call_id,
-                "Canvas cleared successfully. Ready for new content.",
-                request_response=is_last
-            )
+        await self._send_function_result(
+            call_id, "Canvas cleared successfully. Ready for new content."
+        )
 
-    async def _handle_celebrate(self, call_id: str, args: dict, is_last: bool = True) -> None:
+    async def _handle_celebrate(self, call_id: str, args: dict) -> None:
         """Handle the celebrate function call."""
         intensity = args.get("intensity", "big")
         print(f"[Celebration] Triggering {intensity} celebration!")
         await self.send_celebrate(intensity)
 
         # Send function result back to Grok
-        if self.grok_client and self.grok_client.is_connected:
-            await self.grok_client.send_function_result(
-                call_id,
-                f"Celebration ({intensity}) triggered!",
-                request_response=is_last
-            )
+        await self._send_function_result(call_id, f"Celebration ({intensity}) triggered!")
 
-    async def _handle_circle_answer(self, call_id: str, args: dict, is_last: bool = True) -> None:
+    async def _handle_circle_answer(self, call_id: str, args: dict) -> None:
         """Handle the circle_answer function call - draws an ellipse around the student's answer.
 
         Uses bounding box coordinates from check_canvas to properly encircle the answer.
         Adds padding to make the circle visually appealing and not too tight.
 
         COORDINATE TRANSFORMATION:
-        Vision API returns coordinates relative to the exported screenshot image.
-        The screenshot is cropped to content bounds with padding, so we need to transform:
+        Vision API returns coordinates relative to the image it was sent. If that image
+        was preprocessed, they are first mapped back to the exported screenshot
+        (screenshot_px = vision_px / scale + crop offset). The screenshot is cropped to
+        content bounds with padding, so we then transform:
         - vision_x -> canvas_x = vision_x + bounds.x - padding
         - vision_y -> canvas_y = vision_y + bounds.y - padding
         """
@@ -696,12 +1125,23 @@ class TutorConnection:
         height = float(args.get("height", 50))
         color = args.get("color", "light-green")
 
+        # Undo the crop and downscale of a preprocessed screenshot
+        image = self._vision_image
+        bounds = image.bounds if image else self._vision_bounds
+        if image:
+            vision_x, vision_y = image.to_screenshot(vision_x, vision_y)
+            width /= image.scale
+            height /= image.scale
+            print(
+                "[Canvas] Mapped preprocessed image coords to screenshot "
+                f"({vision_x:.0f}, {vision_y:.0f})"
+            )
+
         # Transform vision coordinates to canvas coordinates
-        if self._screenshot_bounds:
+        if bounds:
             # Vision coords are relative to screenshot image
             # Screenshot image = content bounds + padding on each side
             # So: canvas_coord = vision_coord + bounds_origin - padding
-            bounds = self._screenshot_bounds
             canvas_x = vision_x + bounds.x - bounds.padding
             canvas_y = vision_y + bounds.y - bounds.padding
             print(f"[Canvas] Transforming vision coords ({vision_x}, {vision_y}) -> canvas ({canvas_x}, {canvas_y}) using bounds (origin: {bounds.x}, {bounds.y}, padding: {bounds.padding})")
@@ -747,14 +1187,12 @@ class TutorConnection:
         await self.send_tutor_status("drawing")
 
         # Send function result back to Grok
-        if self.grok_client and self.grok_client.is_connected:
-            await self.grok_client.send_function_result(
-                call_id,
-                f"Circle drawn around the answer at ({ellipse_x:.0f}, {ellipse_y:.0f}).",
-                request_response=is_last
-            )
+        await self._send_function_result(
+            call_id,
+            f"Circle drawn around the answer at ({ellipse_x:.0f}, {ellipse_y:.0f}).",
+        )
 
-    async def _handle_check_canvas(self, call_id: str, args: dict, is_last: bool = True) -> None:
+    async def _handle_check_canvas(self, call_id: str, args: dict) -> None:
         """Handle the check_canvas function call - uses vision to read student's work.
 
         This is the ON-DEMAND vision analysis that gets called when Grok needs to
@@ -763,26 +1201,12 @@ class TutorConnection:
 
         Returns both the vision analysis AND the next_y position for drawing.
 
-        Implements a lock to prevent concurrent vision calls and cooldown to prevent retries.
+        Concurrent calls for the same screenshot share one vision request (see
+        analyze_canvas_screenshot), and a cooldown returns the last result to prevent retries.
         """
         current_time = time.time()
         time_since_last = current_time - self._last_check_canvas_time
 
-        # Check if vision is already in progress (prevent concurrent calls)
-        if self._vision_in_progress:
-            print(f"[Vision] check_canvas called but vision already in progress - returning wait message")
-            next_y = int(self._next_y_position)
-            result = f"""Vision analysis is already in progress. Please wait for the result.
-
-DO NOT call check_canvas again - just wait a moment and I'll have the answer.
-
-POSITIONING (use for any drawings):
-- next_y = {next_y}"""
-
-            if self.grok_client and self.grok_client.is_connected:
-                await self.grok_client.send_function_result(call_id, result, request_response=is_last)
-            return
-
         # Check if we're within the cooldown period and have a cached result
         if time_since_last < self._check_canvas_cooldown and self._last_check_canvas_result:
             print(f"[Vision] check_canvas called again within {time_since_last:.1f}s - returning cached result")
@@ -796,44 +1220,69 @@ DO NOT call check_canvas again. Use the result above to respond to the student.
 POSITIONING (use for any drawings):
 - next_y = {next_y}"""
 
-            if self.grok_client and self.grok_client.is_connected:
-                await self.grok_client.send_function_result(call_id, result, request_response=is_last)
+            await self._send_function_result(call_id, result)
             return
 
         print("[Vision] check_canvas tool called - analyzing student's work...")
         self._last_check_canvas_time = current_time
-        self._vision_in_progress = True  # Set lock
 
         # Clear previous check context from the transcript so the UI doesn't show stale feedback
         await self.send_clear_check_context()
 
         vision_result = None
 
-        try:
-            # Try vision analysis if we have a screenshot
-            if self._latest_screenshot and XAI_API_KEY:
-                screenshot_age = current_time - self._screenshot_timestamp
-                print(f"[Vision] Analyzing screenshot from {self._screenshot_source} ({screenshot_age:.1f}s ago)")
-                await self.send_tutor_status("thinking")
-
-                vision_result = await analyze_canvas_screenshot(XAI_API_KEY, self._latest_screenshot)
-                if vision_result:
-                    print(f"[Vision] Analysis complete: {vision_result[:100]}...")
-
-            # For demo: NO FALLBACK - we wait for vision to succeed
-            # If vision failed, provide minimal info but don't suggest asking user
-            if not vision_result:
-                if self._latest_shapes:
-                    freehand_count = sum(1 for s in self._latest_shapes if s.type == "draw")
-                    if freehand_count > 0:
-                        vision_result = f"I can see the student has written something ({freehand_count} handwritten element(s)), but I'm still processing the image. Give me just a moment to read it clearly."
-                    else:
-                        vision_result = "The canvas only has typed text from the tutor - no student work visible yet."
+        # Try vision analysis if we have a screenshot
+        if self._latest_screenshot and XAI_API_KEY:
+            screenshot_age = current_time - self._screenshot_timestamp
+            print(
+                f"[Vision] Analyzing screenshot from {self._screenshot_source} "
+                f"({screenshot_age:.1f}s ago)"
+            )
+            await self.send_tutor_status("thinking")
+
+            draw_ids = self._draw_shape_ids()
+            if (
+                self._vision_prefetch
+                and self._vision_prefetch_screenshot == self._latest_screenshot
+            ):
+                # Same screenshot, so this joins the prefetch's request (or hits the cache)
+                print("[Vision] Reusing prefetched analysis")
+                self._prefetch_stats["used"] += 1
+            # Later screenshots replace these while we wait, so keep the pair we analyzed
+            screenshot, bounds = self._latest_screenshot, self._screenshot_bounds
+            prepared = await self._prepare_screenshot(screenshot, bounds, self._screenshot_shapes)
+            self._vision_image = prepared
+            self._vision_bounds = bounds
+            vision_result = await analyze_canvas_screenshot(
+                XAI_API_KEY,
+                prepared.data_url if prepared else screenshot,
+                cache=vision_cache,
+            )
+            if vision_result:
+                print(f"[Vision] Analysis complete: {vision_result[:100]}...")
+                self._analyzed_draw_ids = draw_ids
+
+        # For demo: NO FALLBACK - we wait for vision to succeed
+        # If vision failed, provide minimal info but don't suggest asking user
+        if not vision_result:
+            if self._latest_shapes:
+                freehand_count = sum(1 for s in self._latest_shapes if s.type == "draw")
+                if freehand_count > 0:
+                    vision_result = (
+                        "I can see the student has written something "
+                        f"({freehand_count} handwritten element(s)), but I'm still processing "
+                        "the image. Give me just a moment to read it clearly."
+                    )
                 else:
-                    vision_result = "The canvas appears to be empty. The student hasn't written anything yet."
-                print(f"[Vision] Vision unavailable, minimal response: {vision_result[:80]}...")
-        finally:
-            self._vision_in_progress = False  # Release lock
+                    vision_result = (
+                        "The canvas only has typed text from the tutor - "
+                        "no student work visible yet."
+                    )
+            else:
+                vision_result = (
+                    "The canvas appears to be empty. The student hasn't written anything yet."
+                )
+            print(f"[Vision] Vision unavailable, minimal response: {vision_result[:80]}...")
 
         # Cache the vision result for retry prevention
         self._last_check_canvas_result = vision_result
@@ -855,24 +1304,243 @@ POSITIONING (use for any drawings):
         print(f"[Vision] Returning result with next_y={next_y}")
 
         # Send the result back to Grok so it can continue responding
-        if self.grok_client and self.grok_client.is_connected:
-            await self.grok_client.send_function_result(call_id, result, request_response=is_last)
+        await self._send_function_result(call_id, result)
+
+    def _draw_shape_ids(self) -> set[str]:
+        """Freehand shapes on the latest screenshot.
+
+        Uses the shapes sent with it when there are some: CANVAS_UPDATE is debounced,
+        so _latest_shapes can miss strokes written just before pressing talk.
+        """
+        shapes = self._screenshot_shapes
+        if shapes is None:
+            shapes = self._latest_shapes
+        return {shape.id for shape in shapes if shape.type == "draw"}
 
-    def _on_grok_audio(self, audio_bytes: bytes) -> None:
-        """Callback when Grok sends audio."""
-        self._audio_queue.put_nowait(audio_bytes)
+    def start_vision_prefetch(self, screenshot: str) -> None:
+        """Start analyzing a VOICE_START screenshot if it shows new handwriting.
 
-    def _on_grok_transcript(self, role: str, text: str) -> None:
+        The student is usually asking about what they just wrote, so by the time
+        Grok calls check_canvas most of the vision latency has already passed.
+        """
+        if not (VISION_PREFETCH and XAI_API_KEY):
+            return
+        if screenshot == self._vision_prefetch_screenshot:
+            return
+        self._cancel_vision_prefetch()
+        draw_ids = self._draw_shape_ids()
+        new_strokes = len(draw_ids - self._analyzed_draw_ids)
+        if not new_strokes:
+            return
+
+        print(f"[Vision] Prefetching analysis for {new_strokes} new stroke(s)")
+        self._vision_prefetch_screenshot = screenshot
+        self._vision_prefetch = asyncio.create_task(
+            self._prefetch_vision(
+                screenshot, self._screenshot_bounds, self._screenshot_shapes, draw_ids
+            )
+        )
+        self._prefetch_stats["started"] += 1
+
+    async def _prefetch_vision(
+        self,
+        screenshot: str,
+        bounds: ScreenshotBounds | None,
+        shapes: list[TldrawShapeData] | None,
+        draw_ids: set[str],
+    ) -> str | None:
+        prepared = await self._prepare_screenshot(screenshot, bounds, shapes)
+        result = await analyze_canvas_screenshot(
+            XAI_API_KEY, prepared.data_url if prepared else screenshot, cache=vision_cache
+        )
+        # Only a finished analysis counts: a cancelled or failed prefetch must not
+        # stop the next one for the same strokes
+        if result:
+            self._analyzed_draw_ids = draw_ids
+        return result
+
+    async def _prepare_screenshot(
+        self,
+        screenshot: str,
+        bounds: ScreenshotBounds | None,
+        shapes: list[TldrawShapeData] | None,
+    ) -> PreparedScreenshot | None:
+        """Cropped and downscaled copy of `screenshot`, or None to send it as-is.
+
+        `bounds` and `shapes` are the ones that arrived with the screenshot.
+        Decoding and re-encoding run in a worker thread. The result is shared by
+        every caller for the same screenshot.
+        """
+        if not (SCREENSHOT_PREPROCESS and PILLOW_AVAILABLE):
+            return None
+        if self._prepared_task is None or self._prepared_for != screenshot:
+            self._prepared_for = screenshot
+            self._prepared_task = asyncio.create_task(
+                asyncio.to_thread(
+                    prepare_screenshot,
+                    screenshot,
+                    bounds,
+                    shapes,
+                    SCREENSHOT_MAX_SIDE,
+                    SCREENSHOT_JPEG_QUALITY,
+                )
+            )
+        prepared = await asyncio.shield(self._prepared_task)
+        if prepared:
+            print(
+                f"[Screenshot] {prepared.original_size / 1024:.0f} KB -> "
+                f"{prepared.size / 1024:.0f} KB "
+                f"(crop at {prepared.crop_x},{prepared.crop_y}, scale {prepared.scale:.2f})"
+            )
+        return prepared
+
+    def _cancel_vision_prefetch(self, newer_screenshot: str | None = None) -> None:
+        """Drop a prefetch whose screenshot is out of date."""
+        if newer_screenshot is not None and newer_screenshot == self._vision_prefetch_screenshot:
+            return
+        if self._vision_prefetch and not self._vision_prefetch.done():
+            self._vision_prefetch.cancel()
+            self._prefetch_stats["cancelled"] += 1
+        self._vision_prefetch = None
+        self._vision_prefetch_screenshot = None
+
+    def _on_grok_audio(self, message: dict) -> Awaitable[None] | None:
+        """Callback when Grok sends audio.
+
+        Json clients get the upstream base64 as-is unless it has to be resampled
+        first; binary clients get decoded PCM16. Under the block policy a full queue
+        returns an awaitable, which makes the Grok client stop reading until the
+        browser catches up.
+        """
+        audio: str | bytes = message["delta"]
+        if self._downlink_resampler:
+            pcm = self._downlink_resampler.process(base64.b64decode(message["delta"]))
+            if not pcm:
+                return None
+            audio = base64.b64encode(pcm).decode("ascii") if self.audio_mode == "json" else pcm
+        elif self.audio_mode == "binary":
+            audio = base64.b64decode(message["delta"])
+        if not self._audio_queue.put_nowait(audio):
+            return self._audio_queue.put(audio)
+        return None
+
+    def _on_audio_backlog(self) -> None:
+        """Callback when the client falls too far behind under the disconnect policy."""
+        asyncio.create_task(self._disconnect_slow_client())
+
+    async def _disconnect_slow_client(self) -> None:
+        """Stop streaming to a client that can't keep up and close its socket."""
+        print(f"[Session {self.session.id[:8]}] Client too far behind on audio, disconnecting")
+        if self._audio_sender_task:
+            self._audio_sender_task.cancel()
+        try:
+            # A stalled socket may never complete the close handshake
+            await asyncio.wait_for(
+                self.websocket.close(code=1013, reason="Client too far behind"), timeout=5.0
+            )
+        except Exception as e:
+            print(f"[Session {self.session.id[:8]}] Error closing slow client: {e}")
+
+    def _on_grok_transcript(self, message: dict) -> None:
         """Callback when Grok sends transcript."""
+        if message["role"] == "tutor":
+            # The final transcript carries the full text, so unsent deltas are dropped
+            self._reset_caption_stream()
         # With tool calling, we don't need to parse text commands anymore
         # Just send the transcript directly
-        asyncio.create_task(self.send_transcript(role, text))
+        asyncio.create_task(
+            self.send_transcript(message["role"], message["text"], message.get("item_id"))
+        )
+
+    def _on_grok_transcript_delta(self, message: dict) -> None:
+        """Callback for each tutor transcript delta when caption streaming is on."""
+        delta = message.get("delta")
+        if not delta:
+            return
+
+        item_id = message.get("item_id") or ""
+        if item_id != self._caption_item_id:
+            self._flush_caption()
+            self._caption_item_id = item_id
+        self._caption_pending.append(delta)
+
+        if self._caption_flush_task is None:
+            wait = self._caption_last_sent + TRANSCRIPT_STREAM_INTERVAL_MS / 1000 - time.monotonic()
+            if wait <= 0:
+                self._flush_caption()
+            else:
+                self._caption_flush_task = asyncio.create_task(self._flush_caption_after(wait))
+
+    async def _flush_caption_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._caption_flush_task = None
+        self._flush_caption()
+
+    def _flush_caption(self) -> None:
+        """Send the deltas gathered since the last caption message."""
+        if not self._caption_pending or self._caption_item_id is None:
+            return
+        text = "".join(self._caption_pending)
+        self._caption_pending.clear()
+        self._caption_last_sent = time.monotonic()
+        asyncio.create_task(self.send_transcript_delta(self._caption_item_id, text))
+
+    def _reset_caption_stream(self) -> None:
+        if self._caption_flush_task:
+            self._caption_flush_task.cancel()
+            self._caption_flush_task = None
+        self._caption_pending.clear()
+        self._caption_item_id = None
+
+    def _audio_ms_played(self) -> float:
+        """How much of the current response's audio the browser has played, approximately."""
+        if self._audio_started_at is None:
+            return 0.0
+        elapsed_ms = (time.monotonic() - self._audio_started_at) * 1000
+        return max(0.0, min(self._audio_ms_sent, elapsed_ms))
+
+    def _tutor_audible(self) -> bool:
+        """Whether the tutor is speaking or the browser is still playing sent audio."""
+        return (
+            self._response_active
+            or len(self._audio_queue) > 0
+            or time.monotonic() < self._playback_ends_at
+        )
 
-    def _on_speech_started(self) -> None:
+    def _on_speech_started(self, message: dict) -> None:
         """Callback when user starts speaking (VAD detected)."""
-        asyncio.create_task(self.send_voice_state("listening"))
+        if self._tutor_audible():
+            # Student is talking over the tutor - stop the tutor right away
+            asyncio.create_task(self._handle_interruption())
+        else:
+            asyncio.create_task(self.send_voice_state("listening"))
+
+    async def _handle_interruption(self) -> None:
+        """Barge-in: cancel the response, flush pending audio, and trim Grok's record.
+
+        Interruption latency would otherwise be bounded by however much tutor audio
+        is still buffered in the outbound queue.
+        """
+        if not self.grok_client:
+            return
+
+        item_id = self.grok_client.current_audio_item_id
+        played_ms = int(self._audio_ms_played())
 
-    def _on_speech_stopped(self) -> None:
+        if self._response_active:
+            await self.grok_client.cancel_response()
+        flushed = self._audio_queue.clear()
+        # The browser drops its playback queue when it sees the interrupted state
+        self._audio_ms_sent = played_ms
+        self._playback_ends_at = time.monotonic()
+        print(f"[Grok] Student interrupted, flushed {flushed} audio chunk(s) after {played_ms}ms")
+
+        await self.send_voice_state("interrupted")
+        if item_id:
+            await self.grok_client.truncate_item(item_id, played_ms)
+        await self.send_voice_state("listening")
+
+    def _on_speech_stopped(self, message: dict) -> None:
         """Callback when user stops speaking (VAD detected).
 
         Note: Canvas context is now injected ON-DEMAND when Grok calls the
@@ -885,65 +1553,177 @@ POSITIONING (use for any drawings):
         await self.send_voice_state("processing")
         await self.send_tutor_status("thinking")
 
-    def _on_response_started(self) -> None:
+    def _on_response_started(self, message: dict) -> None:
         """Callback when Grok starts responding."""
+        self._response_active = True
+        self._audio_ms_sent = 0.0
+        self._audio_started_at = None
         asyncio.create_task(self.send_voice_state("speaking"))
 
-    def _on_response_done(self) -> None:
+    def _on_response_done(self, message: dict) -> None:
         """Callback when Grok finishes responding."""
         # Send idle state so frontend resumes sending audio
         # VAD will trigger 'listening' when user actually speaks
         print("[Grok] Response done, ready for next input")
+        self._response_active = False
+        self._maybe_request_tool_response()
         asyncio.create_task(self.send_voice_state("idle"))
 
-    def _on_grok_error(self, code: str, message: str) -> None:
+    def _on_grok_error(self, message: dict) -> None:
         """Callback when Grok has an error."""
-        asyncio.create_task(self.send_error(code, message))
+        error = message.get("error", {})
+        asyncio.create_task(
+            self.send_error(error.get("code", "unknown"), error.get("message", "Unknown error"))
+        )
+
+    def _on_grok_reconnecting(self, message: dict) -> None:
+        """Callback when the Grok socket dropped and a reconnect attempt is scheduled."""
+        if message["attempt"] == 1:
+            print(
+                f"[Session {self.session.id[:8]}] Grok connection lost, "
+                "resuming in the background"
+            )
+            # The response and any tool calls in flight died with the old session
+            self._response_active = False
+            self._grok_generation += 1
+            while not self._function_queue.empty():
+                self._function_queue.get_nowait()
+            for task in list(self._tool_tasks):
+                task.cancel()  # e.g. a check_canvas waiting on vision
+            self._tools_pending = 0
+            self._tool_results_unanswered = 0
+            self._draw_progress.clear()
+        asyncio.create_task(self.send_upstream_status("reconnecting", message["attempt"]))
+
+    async def _on_grok_reconnected(self, message: dict) -> None:
+        """Callback when a dropped Grok session is configured again.
+
+        The new session starts with an empty conversation, so replay a compact
+        recap of the recent turns and the canvas state before resuming.
+        """
+        if not self.grok_client:
+            return
+
+        recap = self.session.build_history_recap(GROK_REPLAY_MAX_MESSAGES)
+        if recap:
+            await self.grok_client.send_text_message(
+                "[Session resumed after a connection drop. Conversation so far]\n" + recap,
+                role="system",
+            )
+        canvas_summary = self.session.canvas_summary or summarize_canvas(self._latest_shapes)
+        if canvas_summary:
+            await self.grok_client.inject_context(canvas_summary)
+
+        print(
+            f"[Session {self.session.id[:8]}] Grok session resumed "
+            f"({len(recap)} chars of history)"
+        )
+        await self.send_upstream_status("connected", message["attempt"])
+        await self.send_voice_state("idle")
+
+    def _on_grok_reconnect_failed(self, message: dict) -> None:
+        """Callback when every reconnect attempt failed."""
+        asyncio.create_task(self.send_upstream_status("failed", message["attempts"]))
+        asyncio.create_task(
+            self.send_error("GROK_DISCONNECTED", "Lost connection to the tutor, please reconnect")
+        )
 
     async def _audio_sender_loop(self) -> None:
         """Send audio from queue to frontend."""
+        # PCM16 bytes per millisecond at the rate the client plays back
+        bytes_per_ms = self.sample_rate * 2 / 1000
         while True:
-            audio_bytes = await self._audio_queue.get()
-            await self.send_audio(audio_bytes)
+            audio = await self._audio_queue.get()
+            if self._audio_started_at is None:
+                # The browser plays this after whatever it still has queued
+                self._audio_started_at = max(time.monotonic(), self._playback_ends_at)
+            await self.send_audio(audio)
+            size = len(audio) if isinstance(audio, bytes) else len(audio) * 3 // 4
+            self._audio_ms_sent += size / bytes_per_ms
+            self._playback_ends_at = self._audio_started_at + self._audio_ms_sent / 1000
 
     async def connect_to_grok(self) -> None:
         """Connect to Grok Voice API."""
-        print(f"[Grok] Configuring with sample rate: {self.sample_rate}Hz")
-        config = GrokConfig(
-            voice=VOICE,
+        grok_sample_rate = self.sample_rate
+        if RESAMPLE_AUDIO and NUMPY_AVAILABLE and self.sample_rate != GROK_NATIVE_SAMPLE_RATE:
+            grok_sample_rate = GROK_NATIVE_SAMPLE_RATE
+            self._uplink_resampler = StreamingResampler(self.sample_rate, grok_sample_rate)
+            self._downlink_resampler = StreamingResampler(grok_sample_rate, self.sample_rate)
+            print(f"[Audio] Resampling {self.sample_rate}Hz <-> {grok_sample_rate}Hz on the server")
+
+        if VAD_PREFILTER and NUMPY_AVAILABLE:
+            # Gate after resampling so the VAD scores the (smaller) upstream audio
+            self._vad_gate = VoiceActivityGate(
+                grok_sample_rate,
+                energy_threshold_db=VAD_ENERGY_THRESHOLD_DB,
+                pre_roll_ms=VAD_PRE_ROLL_MS,
+                hangover_ms=VAD_HANGOVER_MS,
+            )
+
+        print(f"[Grok] Configuring with sample rate: {grok_sample_rate}Hz")
+        config = build_grok_config(
+            grok_sample_rate,
             instructions=self.session.build_system_prompt()
             if not MATH_TUTOR_INSTRUCTIONS
             else MATH_TUTOR_INSTRUCTIONS,
-            input_sample_rate=self.sample_rate,
-            output_sample_rate=self.sample_rate,
-            tools=CANVAS_TOOLS,
         )
 
-        self.grok_client = GrokVoiceClient(
-            api_key=XAI_API_KEY,
-            config=config,
-            on_audio=self._on_grok_audio,
-            on_transcript=self._on_grok_transcript,
-            on_speech_started=self._on_speech_started,
-            on_speech_stopped=self._on_speech_stopped,
-            on_response_started=self._on_response_started,
-            on_response_done=self._on_response_done,
-            on_error=self._on_grok_error,
-            on_function_call=self._on_function_call,
-        )
-
-        await self.grok_client.connect()
+        # Prefer a pre-warmed session that has already done the handshake
+        pooled_client = grok_pool.acquire(config) if grok_pool else None
+        self.grok_client = pooled_client or GrokVoiceClient(api_key=XAI_API_KEY, config=config)
+        self._attach_grok_callbacks(self.grok_client)
 
         # Start audio sender
         self._audio_sender_task = asyncio.create_task(self._audio_sender_loop())
 
+        if pooled_client:
+            print("[Grok] Using pre-warmed session from pool")
+            self._used_pooled_session = True
+            self._grok_ready_wait_ms = 0.0
+            await self.grok_client.send_initial_greeting()
+            return
+
+        await self.grok_client.connect()
+
         # Wait for session to be ready (configured and greeting sent)
         print("[Grok] Waiting for session to be ready...")
-        while not self.grok_client.is_ready:
-            await asyncio.sleep(0.1)
+        waited = await self.grok_client.wait_until_ready(timeout=GROK_READY_TIMEOUT_SECONDS)
+        self._grok_ready_wait_ms = round(waited * 1000, 1)
+
+    def _attach_grok_callbacks(self, client: GrokVoiceClient) -> None:
+        """Route a Grok client's events to this connection."""
+        client.add_listener(GrokClientEvent.AUDIO, self._on_grok_audio)
+        client.add_listener(GrokClientEvent.TRANSCRIPT, self._on_grok_transcript)
+        if TRANSCRIPT_STREAMING:
+            client.add_listener(
+                GrokMessageType.RESPONSE_OUTPUT_AUDIO_TRANSCRIPT_DELTA,
+                self._on_grok_transcript_delta,
+            )
+        client.add_listener(GrokClientEvent.FUNCTION_CALL, self._on_function_call)
+        if DRAW_STREAMING:
+            client.add_listener(
+                GrokClientEvent.FUNCTION_CALL_ARGS_DELTA, self._on_function_args_delta
+            )
+            client.add_listener(
+                GrokClientEvent.FUNCTION_CALL_DISCARDED, self._on_function_call_discarded
+            )
+        client.add_listener(GrokMessageType.INPUT_AUDIO_SPEECH_STARTED, self._on_speech_started)
+        client.add_listener(GrokMessageType.INPUT_AUDIO_SPEECH_STOPPED, self._on_speech_stopped)
+        client.add_listener(GrokMessageType.RESPONSE_CREATED, self._on_response_started)
+        client.add_listener(GrokMessageType.RESPONSE_DONE, self._on_response_done)
+        client.add_listener(GrokMessageType.ERROR, self._on_grok_error)
+        client.add_listener(GrokClientEvent.RECONNECTING, self._on_grok_reconnecting)
+        client.add_listener(GrokClientEvent.RECONNECTED, self._on_grok_reconnected)
+        client.add_listener(GrokClientEvent.RECONNECT_FAILED, self._on_grok_reconnect_failed)
 
     async def disconnect_from_grok(self) -> None:
         """Disconnect from Grok Voice API."""
+        self._reset_caption_stream()
+        self._cancel_vision_prefetch()
+        if self._prepared_task:
+            self._prepared_task.cancel()
+        for task in list(self._tool_tasks):
+            task.cancel()
         if self._audio_sender_task:
             self._audio_sender_task.cancel()
             try:
@@ -956,9 +1736,26 @@ POSITIONING (use for any drawings):
 
     async def handle_voice_audio(self, audio_b64: str) -> None:
         """Handle incoming audio from frontend."""
-        if self.grok_client and self.grok_client.is_connected:
+        if self._uplink_resampler or self._vad_gate:
+            await self.handle_voice_audio_bytes(base64.b64decode(audio_b64))
+        elif self.grok_client and self.grok_client.is_connected:
             await self.grok_client.send_audio(audio_b64)
 
+    async def handle_voice_audio_bytes(self, pcm: bytes) -> None:
+        """Handle raw PCM16 audio received in a binary WebSocket frame."""
+        if not (self.grok_client and self.grok_client.is_connected):
+            return
+        if self._uplink_resampler:
+            pcm = self._uplink_resampler.process(pcm)
+            if not pcm:
+                return
+        if self._vad_gate:
+            # Silence is held back as pre-roll; speech is forwarded with its onset
+            for chunk in self._vad_gate.process(pcm):
+                await self.grok_client.send_audio_bytes(chunk)
+            return
+        await self.grok_client.send_audio_bytes(pcm)
+
     async def handle_voice_end(self) -> None:
         """Handle voice end signal from frontend.
 
@@ -975,6 +1772,47 @@ POSITIONING (use for any drawings):
             await self.grok_client.request_response()
             self.session.add_message("student", text)
 
+    def _set_screenshot(
+        self,
+        screenshot: str,
+        bounds: ScreenshotBounds | None,
+        shapes: list[TldrawShapeData] | None,
+        source: str,
+    ) -> None:
+        """Make `screenshot` the one check_canvas analyzes, with its bounds and shapes."""
+        self._cancel_vision_prefetch(newer_screenshot=screenshot)
+        self._latest_screenshot = screenshot
+        self._screenshot_timestamp = time.time()
+        self._screenshot_source = source
+        self._screenshot_bounds = bounds
+        self._screenshot_shapes = shapes
+
+    async def handle_voice_start(
+        self,
+        screenshot: str | None,
+        screenshot_bounds: ScreenshotBounds | None,
+        shapes: list[TldrawShapeData] | None,
+    ) -> None:
+        """Handle voice start from frontend.
+
+        The screenshot taken when the student presses talk is newer than the
+        debounced CANVAS_UPDATE, so it becomes the one check_canvas analyzes.
+        """
+        # Store screenshot for on-demand analysis when check_canvas tool is called
+        # This approach avoids blocking and race conditions
+        if screenshot:
+            self._set_screenshot(screenshot, screenshot_bounds, shapes, "voice_start")
+            if screenshot_bounds:
+                print(
+                    f"[Session {self.session.id[:8]}] Screenshot bounds: "
+                    f"origin=({screenshot_bounds.x:.0f}, {screenshot_bounds.y:.0f}), "
+                    f"size=({screenshot_bounds.width:.0f}x{screenshot_bounds.height:.0f}), "
+                    f"padding={screenshot_bounds.padding}"
+                )
+            self.start_vision_prefetch(screenshot)
+
+        await self.send_voice_state("listening")
+
     async def handle_canvas_update(
         self,
         shapes: list[TldrawShapeData],
@@ -991,11 +1829,7 @@ POSITIONING (use for any drawings):
 
         # Store for on-demand vision analysis (when check_canvas tool is called)
         if screenshot:
-            self._latest_screenshot = screenshot
-            self._screenshot_timestamp = time.time()
-            self._screenshot_source = "canvas_update"
-            if screenshot_bounds:
-                self._screenshot_bounds = screenshot_bounds
+            self._set_screenshot(screenshot, screenshot_bounds, shapes, "canvas_update")
             # IMPORTANT: Invalidate cached vision result when canvas changes
             # This ensures the next check_canvas does a fresh analysis
             if self._last_check_canvas_result:
@@ -1063,11 +1897,21 @@ async def websocket_endpoint(websocket: WebSocket):
     except ValueError:
         sample_rate = 48000
 
-    print(f"[WebSocket] Client connected with sample rate: {sample_rate}Hz")
+    # Binary mode carries audio as raw PCM16 frames instead of base64 JSON messages
+    requested_mode = websocket.query_params.get("audio", "json")
+    audio_mode: AudioMode = "binary" if requested_mode == "binary" else "json"
+    if requested_mode not in AUDIO_MODES:
+        print(f"[WebSocket] Unknown audio mode '{requested_mode}', falling back to json")
+
+    print(
+        f"[WebSocket] Client connected with sample rate: {sample_rate}Hz, "
+        f"audio mode: {audio_mode}"
+    )
 
     # Create session
     session = session_manager.create_session()
-    connection = TutorConnection(websocket, session, sample_rate)
+    connection = TutorConnection(websocket, session, sample_rate, audio_mode)
+    active_connections[session.id] = connection
 
     print(f"[Session {session.id[:8]}] Client connected")
 
@@ -1078,12 +1922,27 @@ async def websocket_endpoint(websocket: WebSocket):
 
         # Notify frontend that session is ready for audio streaming
         from .types import SessionReadyMessage
-        await connection.send_json(SessionReadyMessage().model_dump())
+        await connection.send_model(SessionReadyMessage(audioMode=audio_mode))
 
         # Handle messages from frontend
         while True:
             try:
-                data = await websocket.receive_json()
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+
+                # Binary frames carry raw mic audio; control messages stay JSON
+                audio_bytes = message.get("bytes")
+                if audio_bytes is not None:
+                    if audio_mode == "binary":
+                        await connection.handle_voice_audio_bytes(audio_bytes)
+                    else:
+                        await connection.send_error(
+                            "UNEXPECTED_BINARY", "Binary audio frames require ?audio=binary"
+                        )
+                    continue
+
+                data = codec.loads(message.get("text") or "")
                 msg_type = data.get("type", "")
 
                 if msg_type == "VOICE_START":
@@ -1091,18 +1950,19 @@ async def websocket_endpoint(websocket: WebSocket):
                     screenshot_bounds_data = data.get("screenshotBounds")
                     screenshot_size = len(screenshot) if screenshot else 0
                     print(f"[Session {session.id[:8]}] Voice start, screenshot: {bool(screenshot)} ({screenshot_size / 1024:.1f} KB), bounds: {bool(screenshot_bounds_data)}")
-
-                    # Store screenshot for on-demand analysis when check_canvas tool is called
-                    # This approach avoids blocking and race conditions
-                    if screenshot:
-                        connection._latest_screenshot = screenshot
-                        connection._screenshot_timestamp = time.time()
-                        connection._screenshot_source = "voice_start"
-                        if screenshot_bounds_data:
-                            connection._screenshot_bounds = ScreenshotBounds(**screenshot_bounds_data)
-                            print(f"[Session {session.id[:8]}] Screenshot bounds: origin=({connection._screenshot_bounds.x:.0f}, {connection._screenshot_bounds.y:.0f}), size=({connection._screenshot_bounds.width:.0f}x{connection._screenshot_bounds.height:.0f}), padding={connection._screenshot_bounds.padding}")
-
-                    await connection.send_voice_state("listening")
+                    screenshot_bounds = (
+                        ScreenshotBounds(**screenshot_bounds_data)
+                        if screenshot_bounds_data
+                        else None
+                    )
+                    # Older clients send no shapes; their screenshots are then only downscaled
+                    shapes_data = data.get("shapes")
+                    voice_shapes = (
+                        [TldrawShapeData(**s) for s in shapes_data]
+                        if shapes_data is not None
+                        else None
+                    )
+                    await connection.handle_voice_start(screenshot, screenshot_bounds, voice_shapes)
 
                 elif msg_type == "VOICE_AUDIO":
                     audio = data.get("audio", "")
@@ -1132,7 +1992,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     deleted = data.get("deleted", [])
                     await connection.handle_canvas_change(added, modified, deleted)
 
-            except json.JSONDecodeError:
+            except codec.DecodeError:
                 await connection.send_error("INVALID_JSON", "Failed to parse message")
 
     except WebSocketDisconnect:
@@ -1145,8 +2005,9 @@ async def websocket_endpoint(websocket: WebSocket):
     finally:
         # Cleanup
         await connection.disconnect_from_grok()
+        active_connections.pop(session.id, None)
         session_manager.remove_session(session.id)
-        print(f"[Session {session.id[:8]}] Session closed")
+        print(f"[Session {session.id[:8]}] Session closed, stats: {connection.get_stats()}")
 
 
 if __name__ == "__main__":
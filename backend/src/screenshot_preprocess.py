@@ -0,0 +1,163 @@
+"""Crop, downscale and recompress canvas screenshots before they go to the vision model.
+
+Smaller images mean fewer image tokens and a faster check_canvas. The work is
+CPU-bound, so callers run prepare_screenshot in a worker thread.
+"""
+
+import base64
+import binascii
+import io
+from dataclasses import dataclass
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is an optional dependency (pip install .[vision])
+    Image = None  # type: ignore[assignment]
+
+from .types import ScreenshotBounds, TldrawShapeData
+
+PILLOW_AVAILABLE = Image is not None
+
+# Size guesses for shapes whose extent isn't in their props
+_DEFAULT_DRAW_SIZE = (200.0, 80.0)
+# tldraw's dark-theme background, which the client renders behind its exports
+_CANVAS_BACKGROUND = (16, 16, 17)
+_TEXT_HEIGHTS = {"s": 30.0, "m": 50.0, "l": 70.0, "xl": 90.0}
+
+
+@dataclass(frozen=True)
+class PreparedScreenshot:
+    """A processed screenshot and how its pixels map back to the original export."""
+
+    data_url: str
+    bounds: ScreenshotBounds | None  # Canvas bounds of the original export
+    crop_x: int  # Left edge of the crop, in original screenshot pixels
+    crop_y: int  # Top edge of the crop, in original screenshot pixels
+    scale: float  # Processed pixels per original pixel
+    original_size: int  # Length of the original data URL
+    size: int  # Length of data_url
+
+    def to_screenshot(self, x: float, y: float) -> tuple[float, float]:
+        """Map a point in the processed image to the original screenshot."""
+        return x / self.scale + self.crop_x, y / self.scale + self.crop_y
+
+
+def _shape_box(shape: TldrawShapeData) -> tuple[float, float, float, float] | None:
+    """Canvas-space (left, top, right, bottom) of a freehand or text shape, else None."""
+    props = shape.props
+    if shape.type == "draw":
+        scale = float(props.get("scale") or 1)
+        xs, ys = [], []
+        for segment in props.get("segments") or []:
+            points = segment.get("points") if isinstance(segment, dict) else None
+            for point in points or []:
+                if isinstance(point, dict) and "x" in point and "y" in point:
+                    xs.append(point["x"] * scale)
+                    ys.append(point["y"] * scale)
+        if xs:
+            return shape.x + min(xs), shape.y + min(ys), shape.x + max(xs), shape.y + max(ys)
+        width, height = _DEFAULT_DRAW_SIZE
+        return shape.x, shape.y, shape.x + width, shape.y + height
+    if shape.type == "text":
+        w = props.get("w")
+        width = float(w) if isinstance(w, (int, float)) else 400.0
+        height = _TEXT_HEIGHTS.get(props.get("size", "m"), 50.0)
+        return shape.x, shape.y, shape.x + width, shape.y + height
+    return None
+
+
+def content_crop(
+    image_size: tuple[int, int],
+    bounds: ScreenshotBounds,
+    shapes: list[TldrawShapeData],
+    margin: float,
+) -> tuple[int, int, int, int] | None:
+    """Pixel box around the student's strokes and the typed text, or None to keep everything.
+
+    Typed text is kept so the model can still read the problem it checks the
+    answer against. Image pixels relate to the canvas as
+    image = canvas - bounds.x + padding (the export is at scale 1).
+    """
+    boxes = [box for box in map(_shape_box, shapes) if box]
+    if not any(shape.type == "draw" for shape in shapes) or not boxes:
+        return None
+
+    width, height = image_size
+    left = min(box[0] for box in boxes) - bounds.x + bounds.padding - margin
+    top = min(box[1] for box in boxes) - bounds.y + bounds.padding - margin
+    right = max(box[2] for box in boxes) - bounds.x + bounds.padding + margin
+    bottom = max(box[3] for box in boxes) - bounds.y + bounds.padding + margin
+    crop = (
+        max(0, int(left)),
+        max(0, int(top)),
+        min(width, int(right) + 1),
+        min(height, int(bottom) + 1),
+    )
+    if crop[2] - crop[0] < 16 or crop[3] - crop[1] < 16:
+        return None  # Estimates don't overlap the image; don't trust them
+    if crop == (0, 0, width, height):
+        return None
+    return crop
+
+
+def prepare_screenshot(
+    screenshot: str,
+    bounds: ScreenshotBounds | None,
+    shapes: list[TldrawShapeData] | None,
+    max_side: int = 1024,
+    jpeg_quality: int = 80,
+    crop_margin: float = 32.0,
+) -> PreparedScreenshot | None:
+    """Crop to the student's work, downscale to `max_side` and re-encode as JPEG.
+
+    `bounds` and `shapes` must have arrived with this screenshot: shapes from an
+    older canvas update can miss the newest strokes and crop them out. Without
+    shapes the image is only downscaled.
+
+    Returns None when Pillow is missing, the image can't be decoded, or there
+    is nothing to crop or shrink (the original is then sent as-is).
+    """
+    if not PILLOW_AVAILABLE:
+        return None
+
+    data = screenshot.split(",", 1)[1] if screenshot.startswith("data:") else screenshot
+    try:
+        image: Image.Image = Image.open(io.BytesIO(base64.b64decode(data, validate=True)))
+        image.load()
+    except (binascii.Error, ValueError, OSError) as e:
+        print(f"[Screenshot] Could not decode screenshot: {e}")
+        return None
+
+    crop = content_crop(image.size, bounds, shapes, crop_margin) if bounds and shapes else None
+    if crop:
+        image = image.crop(crop)
+    crop_x, crop_y = (crop[0], crop[1]) if crop else (0, 0)
+
+    scale = min(1.0, max_side / max(image.size))
+    if scale < 1.0:
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    if not crop and scale == 1.0:
+        return None
+
+    # JPEG has no alpha: flatten onto the dark canvas so light strokes stay legible
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, _CANVAS_BACKGROUND)
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=jpeg_quality, optimize=True)
+    data_url = "data:image/jpeg;base64," + base64.b64encode(out.getvalue()).decode("ascii")
+    return PreparedScreenshot(
+        data_url=data_url,
+        bounds=bounds,
+        crop_x=crop_x,
+        crop_y=crop_y,
+        scale=scale,
+        original_size=len(screenshot),
+        size=len(data_url),
+    )
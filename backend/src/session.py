@@ -50,6 +50,16 @@ class Session:
         recent = self.messages[-max_messages:]
         return [{"role": m.role, "content": m.content} for m in recent]
 
+    def build_history_recap(self, max_messages: int = 20, max_chars_per_message: int = 300) -> str:
+        """Compact transcript of recent turns, for replaying into a fresh Grok session."""
+        lines = []
+        for m in self.get_conversation_context(max_messages):
+            content = " ".join(m["content"].split())
+            if len(content) > max_chars_per_message:
+                content = content[: max_chars_per_message - 3] + "..."
+            lines.append(f"{m['role'].capitalize()}: {content}")
+        return "\n".join(lines)
+
     def build_system_prompt(self) -> str:
         """Build the system prompt with canvas context."""
         base_prompt = """You are a friendly, encouraging math tutor helping a student work through problems on a shared canvas. You can see what they draw and write.
@@ -151,7 +151,7 @@ WSClientMessage = Union[
 # Server -> Client Messages
 class VoiceStateMessage(BaseModel):
     type: Literal["VOICE_STATE"] = "VOICE_STATE"
-    state: Literal["idle", "listening", "processing", "speaking"]
+    state: Literal["idle", "listening", "processing", "speaking", "interrupted"]
 
 
 class VoiceAudioServerMessage(BaseModel):
@@ -163,6 +163,14 @@ class VoiceTranscriptMessage(BaseModel):
     type: Literal["VOICE_TRANSCRIPT"] = "VOICE_TRANSCRIPT"
     role: Literal["student", "tutor"]
     text: str
+    itemId: str | None = None  # Matches the VOICE_TRANSCRIPT_DELTA messages streamed before it
+
+
+class VoiceTranscriptDeltaMessage(BaseModel):
+    type: Literal["VOICE_TRANSCRIPT_DELTA"] = "VOICE_TRANSCRIPT_DELTA"
+    role: Literal["tutor"] = "tutor"
+    itemId: str
+    delta: str  # Text to append to the caption for itemId
 
 
 class CanvasCommandMessage(BaseModel):
@@ -186,8 +194,19 @@ class CelebrateMessage(BaseModel):
     intensity: Literal["small", "big"] = "big"
 
 
+# Audio transport for both directions: base64 VOICE_AUDIO messages or raw PCM16 binary frames
+AudioMode = Literal["json", "binary"]
+
+
 class SessionReadyMessage(BaseModel):
     type: Literal["SESSION_READY"] = "SESSION_READY"
+    audioMode: AudioMode = "json"  # Negotiated transport for mic and tutor audio
+
+
+class UpstreamStatusMessage(BaseModel):
+    type: Literal["UPSTREAM_STATUS"] = "UPSTREAM_STATUS"
+    status: Literal["reconnecting", "connected", "failed"]
+    attempt: int | None = None
 
 
 class ClearCheckContextMessage(BaseModel):
@@ -198,10 +217,12 @@ WSServerMessage = Union[
     VoiceStateMessage,
     VoiceAudioServerMessage,
     VoiceTranscriptMessage,
+    VoiceTranscriptDeltaMessage,
     CanvasCommandMessage,
     TutorStatusMessage,
     CelebrateMessage,
     SessionReadyMessage,
     ClearCheckContextMessage,
+    UpstreamStatusMessage,
     ErrorMessage,
 ]
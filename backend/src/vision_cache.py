@@ -0,0 +1,93 @@
+"""Process-wide cache of vision results, keyed by the screenshot's content."""
+
+import base64
+import binascii
+import hashlib
+import time
+from collections import OrderedDict
+
+
+def screenshot_hash(screenshot_b64: str) -> str | None:
+    """SHA-256 of the decoded image bytes, or None if the screenshot isn't valid base64.
+
+    Accepts a data URL or bare base64. Hashing the decoded bytes means the same
+    image matches whatever data URL prefix it arrived with.
+    """
+    data = screenshot_b64.split(",", 1)[1] if screenshot_b64.startswith("data:") else screenshot_b64
+    try:
+        image = base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    return hashlib.sha256(image).hexdigest()
+
+
+class VisionCache:
+    """LRU cache of vision analyses with a time-to-live.
+
+    Students often ask "is it right?" several times without touching the board,
+    and a classroom works through the same typed problems, so identical
+    screenshots are common within and across sessions.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+        # Counters exposed on /metrics
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.bytes_saved = 0  # Screenshot bytes not uploaded thanks to hits
+        self.bytes_cached = 0  # Size of the cached analyses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, screenshot_size: int = 0) -> str | None:
+        """Cached analysis for `key`, or None on a miss or an expired entry."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+            self._remove(key)
+            self.expired += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.bytes_saved += screenshot_size
+        return entry[1]
+
+    def put(self, key: str, result: str) -> None:
+        """Store an analysis, evicting the least recently used entries beyond max_entries."""
+        if self.max_entries <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic(), result)
+        self.bytes_cached += len(result)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evicted += 1
+
+    def _remove(self, key: str) -> None:
+        _, result = self._entries.pop(key)
+        self.bytes_cached -= len(result)
+
+    def stats(self) -> dict:
+        """Hit rate and size counters for diagnostics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "bytes_saved": self.bytes_saved,
+            "bytes_cached": self.bytes_cached,
+        }
@@ -0,0 +1,121 @@
+"""Lightweight voice-activity gate for dropping silent mic audio before it goes upstream."""
+
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (pip install .[audio])
+    np = None  # type: ignore[assignment]
+
+
+class VoiceActivityGate:
+    """Energy / zero-crossing VAD over PCM16 chunks with pre-roll and hangover.
+
+    Each chunk is split into short frames and scored in one vectorized pass. A
+    frame counts as speech when it is loud enough, unless it is only slightly
+    above the threshold with a very high zero-crossing rate (hiss, fan noise).
+
+    While the gate is closed, recent chunks are kept as pre-roll and sent ahead of
+    the chunk that opens it, so speech onsets are not clipped. After the last
+    speech frame the gate stays open for the hangover period, so Grok's server VAD
+    still hears the trailing silence it needs to end the turn.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: int = 20,
+        energy_threshold_db: float = -45.0,
+        max_zero_crossing_rate: float = 0.35,
+        pre_roll_ms: int = 300,
+        hangover_ms: int = 800,
+    ):
+        if np is None:
+            raise RuntimeError("numpy is required for the VAD prefilter (pip install .[audio])")
+
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        self.energy_threshold_db = energy_threshold_db
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.pre_roll_bytes = sample_rate * 2 * pre_roll_ms // 1000
+        self.hangover_ms = hangover_ms
+
+        self._pre_roll: deque[bytes] = deque()
+        self._pre_roll_size = 0
+        self._hangover_left_ms = 0.0
+
+        # Counters exposed per session
+        self.bytes_in = 0
+        self.bytes_forwarded = 0
+        self.speech_segments = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._hangover_left_ms > 0
+
+    def reset(self) -> None:
+        """Close the gate and forget buffered pre-roll."""
+        self._pre_roll.clear()
+        self._pre_roll_size = 0
+        self._hangover_left_ms = 0.0
+
+    def process(self, pcm: bytes) -> list[bytes]:
+        """Score a chunk and return the chunks that should be forwarded (possibly none)."""
+        self.bytes_in += len(pcm)
+        chunk_ms = len(pcm) / (self.sample_rate * 2) * 1000
+
+        if self._contains_speech(pcm):
+            if not self.is_open:
+                self.speech_segments += 1
+            self._hangover_left_ms = self.hangover_ms + chunk_ms
+            forward = list(self._pre_roll) + [pcm]
+            self._pre_roll.clear()
+            self._pre_roll_size = 0
+        elif self.is_open:
+            forward = [pcm]
+        else:
+            self._buffer_pre_roll(pcm)
+            forward = []
+
+        self._hangover_left_ms = max(0.0, self._hangover_left_ms - chunk_ms)
+        self.bytes_forwarded += sum(len(chunk) for chunk in forward)
+        return forward
+
+    def stats(self) -> dict[str, int | bool]:
+        """Counters for diagnostics."""
+        return {
+            "bytes_in": self.bytes_in,
+            "bytes_forwarded": self.bytes_forwarded,
+            "bytes_saved": self.bytes_in - self.bytes_forwarded,
+            "speech_segments": self.speech_segments,
+            "gate_open": self.is_open,
+        }
+
+    def _buffer_pre_roll(self, pcm: bytes) -> None:
+        self._pre_roll.append(pcm)
+        self._pre_roll_size += len(pcm)
+        while self._pre_roll:
+            if self._pre_roll_size - len(self._pre_roll[0]) < self.pre_roll_bytes:
+                break
+            self._pre_roll_size -= len(self._pre_roll.popleft())
+
+    def _contains_speech(self, pcm: bytes) -> bool:
+        samples = np.frombuffer(pcm[: len(pcm) // 2 * 2], dtype="<i2").astype(np.float32) / 32768.0
+        if len(samples) == 0:
+            return False
+
+        # Pad the tail so the chunk reshapes into whole frames
+        frame_count = -(-len(samples) // self.frame_samples)
+        padded = np.zeros(frame_count * self.frame_samples, dtype=np.float32)
+        padded[: len(samples)] = samples
+        frames = padded.reshape(frame_count, self.frame_samples)
+
+        energy_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zero_crossing_rate = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        loud = energy_db > self.energy_threshold_db
+        noisy = (zero_crossing_rate > self.max_zero_crossing_rate) & (
+            energy_db < self.energy_threshold_db + 10
+        )
+        return bool(np.any(loud & ~noisy))
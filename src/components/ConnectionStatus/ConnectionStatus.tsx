@@ -4,6 +4,7 @@ import { useTutorStore } from '@/stores/tutorStore';
 
 export function ConnectionStatus() {
   const connectionStatus = useTutorStore((state) => state.connectionStatus);
+  const upstreamStatus = useTutorStore((state) => state.upstreamStatus);
 
   const statusConfig = {
     connected: { color: 'var(--accent-success)', label: 'Connected' },
@@ -12,7 +13,15 @@ export function ConnectionStatus() {
     error: { color: 'var(--accent-error)', label: 'Error' },
   };
 
-  const { color, label } = statusConfig[connectionStatus];
+  const upstreamConfig = {
+    reconnecting: { color: 'var(--accent-warning)', label: 'Reconnecting' },
+    failed: { color: 'var(--accent-error)', label: 'Tutor offline' },
+  };
+
+  const { color, label } =
+    connectionStatus === 'connected' && upstreamStatus !== 'connected'
+      ? upstreamConfig[upstreamStatus]
+      : statusConfig[connectionStatus];
 
   return (
     <div className="connection-status">
@@ -2,6 +2,7 @@ import { useCallback, useEffect, useRef } from 'react';
 import { useTutorStore } from '@/stores/tutorStore';
 import { audioService } from '@/lib/audioService';
 import { captureCanvasScreenshotWithBounds } from '@/lib/canvasUtils';
+import type { TldrawShapeData } from '@/types';
 
 export function useVoice() {
   const isRecordingRef = useRef(false);
@@ -51,18 +52,29 @@ export function useVoice() {
       // This is critical because server-side VAD may commit audio before VOICE_END
       let screenshot: string | undefined;
       let screenshotBounds: { x: number; y: number; width: number; height: number; padding: number } | undefined;
+      let shapes: TldrawShapeData[] | undefined;
       if (editorRef) {
         console.log('[Voice] Capturing canvas screenshot for voice context...');
+        // Read the shapes with the screenshot: CANVAS_UPDATE is debounced, so the
+        // backend may not have seen the strokes the student just wrote
+        const currentShapes = editorRef.getCurrentPageShapes();
         const result = await captureCanvasScreenshotWithBounds(editorRef);
         if (result) {
           screenshot = result.dataUrl;
           screenshotBounds = { ...result.bounds, padding: result.padding };
+          shapes = currentShapes.map((shape) => ({
+            id: shape.id,
+            type: shape.type,
+            x: shape.x,
+            y: shape.y,
+            props: shape.props as Record<string, unknown>,
+          }));
           console.log('[Voice] Screenshot captured, sending with VOICE_START, bounds:', result.bounds);
         }
       }
 
       console.log('[Voice] Sending VOICE_START');
-      send({ type: 'VOICE_START', screenshot, screenshotBounds });
+      send({ type: 'VOICE_START', screenshot, screenshotBounds, shapes });
 
       let chunkCount = 0;
       await audioService.startCapture(
@@ -5,6 +5,7 @@ import type {
   TutorState,
   Message,
   ConnectionStatus,
+  UpstreamStatus,
   WSServerMessage,
   CanvasCommand,
   WSClientMessage,
@@ -41,6 +42,7 @@ interface TutorStoreState {
   // Connection
   connectionStatus: ConnectionStatus;
   sessionReady: boolean; // True when backend Grok session is ready for audio
+  upstreamStatus: UpstreamStatus; // Backend's Grok connection, may drop and resume mid-session
 
   // Canvas Reference (for external access)
   editorRef: Editor | null;
@@ -108,6 +110,7 @@ const initialState: TutorStoreState = {
   messages: [],
   connectionStatus: 'disconnected',
   sessionReady: false,
+  upstreamStatus: 'connected',
   editorRef: null,
   latestCanvasScreenshot: null,
   latestScreenshotBounds: null,
@@ -239,6 +242,9 @@ export const useTutorStore = create<TutorStore>()((set, get) => {
             // Grok finished speaking, ready for next input
             setVoiceState('idle');
             setTutorState({ type: 'idle' });
+          } else if (message.state === 'interrupted') {
+            // Student talked over the tutor - drop any audio still buffered for playback
+            audioService.stopPlayback();
           }
           // Ignore listening/processing from backend - frontend controls these
           break;
@@ -277,13 +283,53 @@ export const useTutorStore = create<TutorStore>()((set, get) => {
               };
             });
           } else {
-            // Tutor messages are added normally
-            addMessage({ role: message.role, content: message.text });
+            // Replace the streamed caption for this item with the final text, if there is one
+            const itemId = message.itemId ?? undefined;
+            const streamed = itemId
+              ? get().messages.findIndex((m) => m.itemId === itemId)
+              : -1;
+            if (streamed >= 0) {
+              set((state) => ({
+                messages: state.messages.map((m, i) =>
+                  i === streamed ? { ...m, content: message.text } : m
+                ),
+              }));
+            } else {
+              // Tutor messages are added normally
+              addMessage({ role: message.role, content: message.text, itemId });
+            }
             // Note: Celebrations are triggered via explicit CELEBRATE messages from the backend
             // when Grok uses the celebrate() tool, not via keyword matching
           }
           break;
 
+        case 'VOICE_TRANSCRIPT_DELTA':
+          // Live caption: append to the tutor message for this item, creating it on first delta
+          set((state) => {
+            const index = state.messages.findIndex((m) => m.itemId === message.itemId);
+            if (index < 0) {
+              return {
+                messages: [
+                  ...state.messages,
+                  {
+                    id: crypto.randomUUID(),
+                    timestamp: new Date(),
+                    role: message.role,
+                    content: message.delta,
+                    itemId: message.itemId,
+                  },
+                ],
+              };
+            }
+            const newMessages = [...state.messages];
+            newMessages[index] = {
+              ...newMessages[index],
+              content: newMessages[index].content + message.delta,
+            };
+            return { messages: newMessages };
+          });
+          break;
+
         case 'TUTOR_STATUS':
           setTutorState({ type: message.status });
           break;
@@ -313,7 +359,17 @@ export const useTutorStore = create<TutorStore>()((set, get) => {
         case 'SESSION_READY':
           // Backend Grok session is ready for audio streaming
           console.log('[WebSocket] Session ready, can start audio streaming');
-          set({ sessionReady: true });
+          set({ sessionReady: true, upstreamStatus: 'connected' });
+          break;
+
+        case 'UPSTREAM_STATUS':
+          // Backend lost its Grok connection and is resuming it; hold mic audio meanwhile
+          console.log(`[WebSocket] Upstream ${message.status} (attempt ${message.attempt ?? '-'})`);
+          set({ upstreamStatus: message.status, sessionReady: message.status === 'connected' });
+          if (message.status === 'connected') {
+            setVoiceState('idle');
+            setTutorState({ type: 'idle' });
+          }
           break;
 
         case 'CLEAR_CHECK_CONTEXT':
@@ -14,11 +14,15 @@ export interface Message {
   content: string;
   timestamp: Date;
   isOptimistic?: boolean;
+  itemId?: string; // Grok item id, links streamed caption deltas to the final transcript
 }
 
 // Connection Status
 export type ConnectionStatus = 'disconnected' | 'connecting' | 'connected' | 'error';
 
+// Backend <-> Grok connection status (the backend resumes dropped Grok sessions)
+export type UpstreamStatus = 'connected' | 'reconnecting' | 'failed';
+
 // Screenshot bounds info for coordinate transformation
 export interface ScreenshotBounds {
   x: number;
@@ -30,7 +34,7 @@ export interface ScreenshotBounds {
 
 // WebSocket Message Types - Frontend to Backend
 export type WSClientMessage =
-  | { type: 'VOICE_START'; screenshot?: string; screenshotBounds?: ScreenshotBounds }  // Screenshot sent at start so Grok has context before VAD commits
+  | { type: 'VOICE_START'; screenshot?: string; screenshotBounds?: ScreenshotBounds; shapes?: TldrawShapeData[] }  // Screenshot (and the shapes it shows) sent at start so Grok has context before VAD commits
   | { type: 'VOICE_AUDIO'; audio: string }
   | { type: 'VOICE_END' }
   | { type: 'TEXT_MESSAGE'; text: string }
@@ -39,14 +43,16 @@ export type WSClientMessage =
 
 // WebSocket Message Types - Backend to Frontend
 export type WSServerMessage =
-  | { type: 'VOICE_STATE'; state: 'idle' | 'listening' | 'processing' | 'speaking' }
+  | { type: 'VOICE_STATE'; state: 'idle' | 'listening' | 'processing' | 'speaking' | 'interrupted' }
   | { type: 'VOICE_AUDIO'; audio: string }
-  | { type: 'VOICE_TRANSCRIPT'; role: 'student' | 'tutor'; text: string }
+  | { type: 'VOICE_TRANSCRIPT'; role: 'student' | 'tutor'; text: string; itemId?: string | null }
+  | { type: 'VOICE_TRANSCRIPT_DELTA'; role: 'tutor'; itemId: string; delta: string }
   | { type: 'CANVAS_COMMAND'; command: CanvasCommand }
   | { type: 'TUTOR_STATUS'; status: 'thinking' | 'watching' | 'drawing' }
   | { type: 'CELEBRATE'; intensity?: 'small' | 'big' }
   | { type: 'SESSION_READY' }
   | { type: 'CLEAR_CHECK_CONTEXT' }
+  | { type: 'UPSTREAM_STATUS'; status: UpstreamStatus; attempt?: number | null }
   | { type: 'ERROR'; code: string; message: string };
 
 // Canvas Command Types